@@ -0,0 +1,21 @@
+"""
+ASGI middleware shared by the API application.
+"""
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..services.strategy_service import request_scope
+
+
+class RequestScopeMiddleware:
+    """Pure ASGI middleware giving each HTTP request its own strategy definition identity map."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with request_scope():
+            await self.app(scope, receive, send)
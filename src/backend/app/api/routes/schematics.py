@@ -7,6 +7,7 @@ Provides endpoints for:
 - Validating strategies against schematics
 - Exporting schematics in different formats
 """
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query, Path
 from fastapi.responses import Response
@@ -59,6 +60,12 @@ class ValidationRequest(BaseModel):
     validated_by: str = Field(..., description="User performing validation")
 
 
+class BatchValidationRequest(BaseModel):
+    """Request model for validating several strategies against one schematic."""
+    strategy_ids: List[str] = Field(..., min_length=1, description="IDs of strategies to validate")
+    validated_by: str = Field(..., description="User performing validation")
+
+
 class ValidationResponse(BaseModel):
     """Response model for validation results."""
     validation_id: str
@@ -114,7 +121,7 @@ async def upload_schematic(
         
         # Upload and parse
         schematic_service = get_schematic_service()
-        schematic_data = schematic_service.upload_schematic(
+        schematic_data = await schematic_service.upload_schematic_async(
             file_content=file.file,
             filename=file.filename,
             created_by=created_by,
@@ -146,7 +153,9 @@ async def upload_schematic(
 async def list_schematics(
     created_by: Optional[str] = Query(None, description="Filter by creator"),
     format_type: Optional[str] = Query(None, description="Filter by format (gdsii, dxf, svg)"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
+    after: Optional[datetime] = Query(None, description="Upload date of the last schematic on the previous page (next page cursor)"),
+    after_id: Optional[str] = Query(None, description="ID of the last schematic on the previous page; breaks ties on after")
 ):
     """
     List available schematics with filtering options.
@@ -165,10 +174,12 @@ async def list_schematics(
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid format type: {format_type}")
         
-        schematics = schematic_service.list_schematics(
+        schematics = await schematic_service.list_schematics_async(
             created_by=created_by,
             format_type=format_enum,
-            limit=limit
+            limit=limit,
+            after=after,
+            after_id=after_id
         )
         
         return SchematicListResponse(
@@ -193,7 +204,7 @@ async def get_schematic(
     """
     try:
         schematic_service = get_schematic_service()
-        schematic_data = schematic_service.get_schematic(schematic_id)
+        schematic_data = await schematic_service.get_schematic_async(schematic_id)
         
         if not schematic_data:
             raise HTTPException(status_code=404, detail=f"Schematic not found: {schematic_id}")
@@ -231,7 +242,7 @@ async def get_die_boundaries(
     """
     try:
         schematic_service = get_schematic_service()
-        schematic_data = schematic_service.get_schematic(schematic_id)
+        schematic_data = await schematic_service.get_schematic_async(schematic_id)
         
         if not schematic_data:
             raise HTTPException(status_code=404, detail=f"Schematic not found: {schematic_id}")
@@ -286,7 +297,7 @@ async def validate_strategy(
         strategy_service = get_strategy_service()
         
         # Get schematic
-        schematic_data = schematic_service.get_schematic(schematic_id)
+        schematic_data = await schematic_service.get_schematic_async(schematic_id)
         if not schematic_data:
             raise HTTPException(status_code=404, detail=f"Schematic not found: {schematic_id}")
         
@@ -296,26 +307,13 @@ async def validate_strategy(
             raise HTTPException(status_code=404, detail=f"Strategy not found: {request.strategy_id}")
         
         # Perform validation
-        validation_result = schematic_service.validate_strategy_against_schematic(
+        validation_result = await schematic_service.validate_strategy_against_schematic_async(
             strategy=strategy,
             schematic_id=schematic_id,
             validated_by=request.validated_by
         )
         
-        return ValidationResponse(
-            validation_id=validation_result.validation_id,
-            schematic_id=validation_result.schematic_id,
-            strategy_id=validation_result.strategy_id,
-            validation_status=validation_result.validation_status.value,
-            alignment_score=validation_result.alignment_score,
-            coverage_percentage=validation_result.coverage_percentage,
-            total_points=validation_result.total_strategy_points,
-            valid_points=validation_result.valid_strategy_points,
-            error_count=len([c for c in validation_result.conflicts if c.severity == "error"]),
-            warning_count=len(validation_result.warnings) + len([c for c in validation_result.conflicts if c.severity == "warning"]),
-            recommendations=validation_result.recommendations,
-            validation_date=validation_result.validation_date.isoformat()
-        )
+        return _to_validation_response(validation_result)
         
     except HTTPException:
         raise
@@ -324,10 +322,74 @@ async def validate_strategy(
         raise HTTPException(status_code=500, detail="Validation failed due to internal error")
 
 
+@router.post("/{schematic_id}/validate/batch", response_model=List[ValidationResponse])
+async def validate_strategies(
+    schematic_id: str = Path(..., description="Schematic ID"),
+    request: BatchValidationRequest = None
+):
+    """
+    Validate several strategies against the same schematic.
+    
+    The schematic is loaded and indexed once for the whole batch.
+    Results are returned in the order of the requested strategy IDs.
+    """
+    try:
+        schematic_service = get_schematic_service()
+        strategy_service = get_strategy_service()
+        
+        # Get schematic
+        schematic_data = await schematic_service.get_schematic_async(schematic_id)
+        if not schematic_data:
+            raise HTTPException(status_code=404, detail=f"Schematic not found: {schematic_id}")
+        
+        # Get strategies
+        strategies = []
+        for strategy_id in request.strategy_ids:
+            strategy = strategy_service.get_strategy(strategy_id)
+            if not strategy:
+                raise HTTPException(status_code=404, detail=f"Strategy not found: {strategy_id}")
+            strategies.append(strategy)
+        
+        # Perform validation
+        validation_results = await schematic_service.validate_strategies_async(
+            strategies=strategies,
+            schematic_id=schematic_id,
+            validated_by=request.validated_by
+        )
+        
+        return [_to_validation_response(result) for result in validation_results]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error validating strategies against schematic: {e}")
+        raise HTTPException(status_code=500, detail="Validation failed due to internal error")
+
+
+def _to_validation_response(validation_result) -> ValidationResponse:
+    """Build the API response for a validation result."""
+    return ValidationResponse(
+        validation_id=validation_result.validation_id,
+        schematic_id=validation_result.schematic_id,
+        strategy_id=validation_result.strategy_id,
+        validation_status=validation_result.validation_status.value,
+        alignment_score=validation_result.alignment_score,
+        coverage_percentage=validation_result.coverage_percentage,
+        total_points=validation_result.total_strategy_points,
+        valid_points=validation_result.valid_strategy_points,
+        error_count=validation_result.error_count,
+        warning_count=validation_result.warning_count,
+        recommendations=validation_result.recommendations,
+        validation_date=validation_result.validation_date.isoformat()
+    )
+
+
 @router.get("/{schematic_id}/validations")
 async def list_validations(
     schematic_id: str = Path(..., description="Schematic ID"),
-    limit: int = Query(50, ge=1, le=200, description="Maximum number of results")
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of results"),
+    after: Optional[datetime] = Query(None, description="Validation date of the last result on the previous page (next page cursor)"),
+    after_id: Optional[str] = Query(None, description="Validation ID of the last result on the previous page; breaks ties on after")
 ):
     """
     List validation results for a schematic.
@@ -339,14 +401,16 @@ async def list_validations(
         schematic_service = get_schematic_service()
         
         # Verify schematic exists
-        schematic_data = schematic_service.get_schematic(schematic_id)
+        schematic_data = await schematic_service.get_schematic_async(schematic_id)
         if not schematic_data:
             raise HTTPException(status_code=404, detail=f"Schematic not found: {schematic_id}")
         
         # Get validation results
-        validations = schematic_service.list_validation_results(
+        validations = await schematic_service.list_validation_results_async(
             schematic_id=schematic_id,
-            limit=limit
+            limit=limit,
+            after=after,
+            after_id=after_id
         )
         
         return {
@@ -374,7 +438,7 @@ async def get_validation_result(
     """
     try:
         schematic_service = get_schematic_service()
-        validation_result = schematic_service.get_validation_result(validation_id)
+        validation_result = await schematic_service.get_validation_result_async(validation_id)
         
         if not validation_result:
             raise HTTPException(status_code=404, detail=f"Validation result not found: {validation_id}")
@@ -408,13 +472,13 @@ async def export_schematic(
         schematic_service = get_schematic_service()
         
         # Verify schematic exists
-        schematic_data = schematic_service.get_schematic(schematic_id)
+        schematic_data = await schematic_service.get_schematic_async(schematic_id)
         if not schematic_data:
             raise HTTPException(status_code=404, detail=f"Schematic not found: {schematic_id}")
         
         # Export to format
         format_enum = SchematicFormat(format_type)
-        export_data = schematic_service.export_schematic(schematic_id, format_enum)
+        export_data = await schematic_service.export_schematic_async(schematic_id, format_enum)
         
         # Determine content type and filename
         content_types = {
@@ -451,12 +515,12 @@ async def delete_schematic(
         schematic_service = get_schematic_service()
         
         # Verify schematic exists
-        schematic_data = schematic_service.get_schematic(schematic_id)
+        schematic_data = await schematic_service.get_schematic_async(schematic_id)
         if not schematic_data:
             raise HTTPException(status_code=404, detail=f"Schematic not found: {schematic_id}")
         
         # Delete schematic
-        success = schematic_service.delete_schematic(schematic_id)
+        success = await schematic_service.delete_schematic_async(schematic_id)
         
         if success:
             return {"message": f"Schematic {schematic_id} deleted successfully"}
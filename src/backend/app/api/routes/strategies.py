@@ -1,7 +1,7 @@
 """
 Strategy API Routes - RESTful endpoints for strategy management.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 from datetime import datetime
@@ -9,7 +9,7 @@ from datetime import datetime
 from ...core.strategy.definition import StrategyDefinition, StrategyType, StrategyLifecycle
 from ...core.strategy.repository import StrategyManager, StrategyRepository
 from ...core.strategy.compilation import StrategyCompiler
-from ...services.strategy_service import StrategyService
+from ...services.strategy_service import StrategyService, get_strategy_service
 from ...core.models.errors import (
     StandardErrorResponse, ValidationErrorResponse, NotFoundErrorResponse,
     create_validation_error, create_not_found_error, create_business_logic_error
@@ -37,6 +37,10 @@ class StrategyUpdateRequest(BaseModel):
     transformations: Optional[Dict[str, Any]] = None
 
 
+class BulkUpdateItem(StrategyUpdateRequest):
+    strategy_id: str
+
+
 class StrategyResponse(BaseModel):
     id: str
     name: str
@@ -73,25 +77,25 @@ class SimulationRequest(BaseModel):
     wafer_map_data: Dict[str, Any]
     process_parameters: Dict[str, Any] = Field(default_factory=dict)
     tool_constraints: Dict[str, Any] = Field(default_factory=dict)
+    columnar_points: bool = False
+
+
+class BatchSimulationItem(SimulationRequest):
+    strategy_id: str
+
+
+class BatchSimulationRequest(BaseModel):
+    items: List[BatchSimulationItem] = Field(..., min_length=1)
 
 
 class SimulationResult(BaseModel):
-    selected_points: List[Dict[str, Any]]
+    # One {x, y, available} record per die, or parallel x/y/available lists when columnar_points is set
+    selected_points: Union[List[Dict[str, Any]], Dict[str, List[Any]]]
     coverage_stats: Dict[str, Any]
     performance_metrics: Dict[str, Any]
     warnings: List[str] = Field(default_factory=list)
 
 
-# Dependency injection - singleton for development
-_strategy_service = None
-
-def get_strategy_service() -> StrategyService:
-    global _strategy_service
-    if _strategy_service is None:
-        _strategy_service = StrategyService()
-    return _strategy_service
-
-
 @router.post("/", response_model=StrategyResponse, responses={400: {"model": ValidationErrorResponse}})
 async def create_strategy(
     request: StrategyCreateRequest,
@@ -185,6 +189,29 @@ async def update_strategy(
         raise HTTPException(status_code=500, detail=error_response.dict())
 
 
+@router.post("/bulk-update", response_model=List[StrategyResponse], responses={404: {"model": NotFoundErrorResponse}, 400: {"model": ValidationErrorResponse}})
+async def bulk_update_strategies(
+    request: List[BulkUpdateItem],
+    service: StrategyService = Depends(get_strategy_service)
+):
+    """Update several strategies and save them in one batch; nothing is saved if any update fails."""
+    try:
+        definitions = service.bulk_update([
+            (item.strategy_id, item.dict(exclude_unset=True, exclude={"strategy_id"}))
+            for item in request
+        ])
+        return [StrategyResponse.from_definition(definition) for definition in definitions]
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            error_response = create_not_found_error("Strategy", str(e).rpartition(": ")[2])
+            raise HTTPException(status_code=404, detail=error_response.dict())
+        error_response = create_validation_error(str(e))
+        raise HTTPException(status_code=400, detail=error_response.dict())
+    except Exception as e:
+        error_response = create_business_logic_error(f"Strategy update failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=error_response.dict())
+
+
 @router.post("/{strategy_id}/clone", response_model=StrategyResponse)
 async def clone_strategy(
     strategy_id: str,
@@ -232,11 +259,12 @@ async def simulate_strategy(
 ):
     """Simulate strategy execution and return results."""
     try:
-        result = service.simulate_strategy(
+        result = await service.simulate_strategy_async(
             strategy_id=strategy_id,  # Use path parameter instead of request body
             wafer_map_data=request.wafer_map_data,
             process_parameters=request.process_parameters,
-            tool_constraints=request.tool_constraints
+            tool_constraints=request.tool_constraints,
+            columnar=request.columnar_points
         )
         
         return SimulationResult(**result)
@@ -253,6 +281,36 @@ async def simulate_strategy(
         raise HTTPException(status_code=500, detail=error_response.dict())
 
 
+@router.post("/simulate/batch", response_model=List[SimulationResult], responses={404: {"model": NotFoundErrorResponse}, 400: {"model": ValidationErrorResponse}})
+async def simulate_strategies_batch(
+    request: BatchSimulationRequest,
+    service: StrategyService = Depends(get_strategy_service)
+):
+    """Run several simulations concurrently; results are returned in request order."""
+    try:
+        results = await service.simulate_strategies_batch([
+            {
+                "strategy_id": item.strategy_id,
+                "wafer_map_data": item.wafer_map_data,
+                "process_parameters": item.process_parameters,
+                "tool_constraints": item.tool_constraints,
+                "columnar": item.columnar_points
+            }
+            for item in request.items
+        ])
+        return [SimulationResult(**result) for result in results]
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            error_response = create_not_found_error("Strategy")
+            raise HTTPException(status_code=404, detail=error_response.dict())
+        else:
+            error_response = create_validation_error(str(e))
+            raise HTTPException(status_code=400, detail=error_response.dict())
+    except Exception as e:
+        error_response = create_business_logic_error(f"Simulation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=error_response.dict())
+
+
 @router.get("/{strategy_id}/versions")
 async def get_strategy_versions(
     strategy_id: str,
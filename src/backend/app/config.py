@@ -44,6 +44,10 @@ class APIConfig(BaseSettings):
     allow_methods: List[str] = Field(default=["*"])
     allow_headers: List[str] = Field(default=["*"])
     
+    # Compression settings
+    gzip_minimum_size: int = Field(default=4096)  # bytes
+    gzip_compresslevel: int = Field(default=1)
+    
     class Config:
         env_prefix = "API_"
 
@@ -1,13 +1,18 @@
 """
 SQLAlchemy database models for strategy persistence.
 """
+import io
 import json
+from contextlib import contextmanager
+from dataclasses import asdict
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, Index
+
+import numpy as np
+from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy import create_engine, ForeignKey
+from sqlalchemy import create_engine, inspect, ForeignKey
 
 from ..strategy.definition import StrategyDefinition, StrategyType, StrategyLifecycle, RuleConfig, ConditionalLogic, TransformationConfig
 from ..models.schematic import SchematicData, SchematicValidationResult, SchematicFormat, CoordinateSystem, ValidationStatus, DieBoundary, SchematicMetadata
@@ -68,7 +73,7 @@ class StrategyModel(Base):
         # Convert rules
         rules = []
         for rule_data in rules_data:
-            rule = RuleConfig(
+            rule = RuleConfig.get_or_create(
                 rule_type=rule_data.get('rule_type', 'fixed_point'),
                 parameters=rule_data.get('parameters', {}),
                 weight=rule_data.get('weight', 1.0),
@@ -116,18 +121,18 @@ class StrategyModel(Base):
                 'enabled': rule.enabled
             }
             if rule.conditions:
-                rule_dict['conditions'] = rule.conditions.__dict__
+                rule_dict['conditions'] = asdict(rule.conditions)
             rules_data.append(rule_dict)
         
         # Serialize conditions
         conditions_json = None
         if definition.conditions:
-            conditions_json = json.dumps(definition.conditions.__dict__)
+            conditions_json = json.dumps(asdict(definition.conditions))
         
         # Serialize transformations
         transformations_json = None
         if definition.transformations:
-            transformations_json = json.dumps(definition.transformations.__dict__)
+            transformations_json = json.dumps(asdict(definition.transformations))
         
         return cls(
             id=definition.id,
@@ -188,18 +193,96 @@ class DatabaseManager:
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
     def create_tables(self):
-        """Create all database tables."""
+        """Create all database tables and bring tables from older releases up to date."""
         Base.metadata.create_all(bind=self.engine)
+        self._upgrade_tables()
+    
+    def _upgrade_tables(self):
+        """
+        Add nullable columns and indexes introduced after a table was first created.
+        create_all never alters existing tables, so older databases would otherwise
+        fail every query that selects a newer column.
+        """
+        with self.engine.begin() as connection:
+            inspector = inspect(connection)
+            quote = connection.dialect.identifier_preparer.quote
+            for table in Base.metadata.sorted_tables:
+                existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    # Only nullable columns can be added to tables that already hold rows
+                    if column.name not in existing_columns and column.nullable:
+                        column_type = column.type.compile(dialect=connection.dialect)
+                        connection.exec_driver_sql(
+                            f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                        )
+                existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name not in existing_indexes:
+                        index.create(bind=connection)
     
     def get_session(self):
         """Get a database session."""
         return self.SessionLocal()
     
+    @contextmanager
+    def session_scope(self):
+        """Provide a session that commits on success, rolls back on error and always closes."""
+        session = self.SessionLocal()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
     def drop_tables(self):
         """Drop all database tables (for testing)."""
         Base.metadata.drop_all(bind=self.engine)
 
 
+def _pack_die_boundaries(boundaries: List[DieBoundary]) -> bytes:
+    """Encode die boundaries as an NPZ archive of column arrays."""
+    n = len(boundaries)
+    bounds = np.array(
+        [(d.x_min, d.y_min, d.x_max, d.y_max, d.center_x, d.center_y) for d in boundaries],
+        dtype=np.float64
+    ).reshape(n, 6)
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        bounds=bounds,
+        available=np.fromiter((d.available for d in boundaries), dtype=bool, count=n),
+        die_ids=np.array([d.die_id for d in boundaries], dtype=str),
+        metadata=np.frombuffer(json.dumps([d.metadata for d in boundaries]).encode(), dtype=np.uint8)
+    )
+    return buffer.getvalue()
+
+
+def _unpack_die_boundaries(blob: bytes) -> List[DieBoundary]:
+    """Decode die boundaries packed by _pack_die_boundaries."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+        bounds = arrays['bounds'].tolist()
+        available = arrays['available'].tolist()
+        die_ids = arrays['die_ids'].tolist()
+        metadata = json.loads(arrays['metadata'].tobytes())
+    return [
+        DieBoundary(
+            die_id=die_id,
+            x_min=b[0],
+            y_min=b[1],
+            x_max=b[2],
+            y_max=b[3],
+            center_x=b[4],
+            center_y=b[5],
+            available=a,
+            metadata=m
+        )
+        for die_id, b, a, m in zip(die_ids, bounds, available, metadata)
+    ]
+
+
 class SchematicModel(Base):
     """SQLAlchemy model for schematic data persistence."""
     __tablename__ = "schematics"
@@ -214,8 +297,10 @@ class SchematicModel(Base):
     coordinate_system = Column(String(50), default="cartesian")
     wafer_size = Column(String(20), nullable=True)
     
-    # Die boundaries (stored as JSON)
+    # Die boundaries, packed as column arrays (see _pack_die_boundaries).
+    # The JSON column is the legacy encoding and is left as [] for packed rows.
     die_boundaries_json = Column(Text, nullable=False)
+    die_boundaries_blob = Column(LargeBinary, nullable=True)
     
     # Metadata (stored as JSON)
     metadata_json = Column(Text, nullable=True)
@@ -235,26 +320,30 @@ class SchematicModel(Base):
         Index('ix_schematics_format_type', 'format_type'),
         Index('ix_schematics_upload_date', 'upload_date'),
         Index('ix_schematics_created_by', 'created_by'),
+        Index('ix_schematics_created_by_upload_date', 'created_by', 'upload_date'),
+        Index('ix_schematics_format_type_upload_date', 'format_type', 'upload_date'),
     )
     
     def to_schematic_data(self) -> SchematicData:
         """Convert database model to SchematicData domain object."""
-        # Parse die boundaries
-        die_boundaries_data = json.loads(self.die_boundaries_json)
-        die_boundaries = []
-        for die_data in die_boundaries_data:
-            die_boundary = DieBoundary(
-                die_id=die_data['die_id'],
-                x_min=die_data['x_min'],
-                y_min=die_data['y_min'],
-                x_max=die_data['x_max'],
-                y_max=die_data['y_max'],
-                center_x=die_data['center_x'],
-                center_y=die_data['center_y'],
-                available=die_data.get('available', True),
-                metadata=die_data.get('metadata', {})
-            )
-            die_boundaries.append(die_boundary)
+        # Parse die boundaries; rows written before the binary column fall back to JSON
+        if self.die_boundaries_blob is not None:
+            die_boundaries = _unpack_die_boundaries(self.die_boundaries_blob)
+        else:
+            die_boundaries = [
+                DieBoundary(
+                    die_id=die_data['die_id'],
+                    x_min=die_data['x_min'],
+                    y_min=die_data['y_min'],
+                    x_max=die_data['x_max'],
+                    y_max=die_data['y_max'],
+                    center_x=die_data['center_x'],
+                    center_y=die_data['center_y'],
+                    available=die_data.get('available', True),
+                    metadata=die_data.get('metadata', {})
+                )
+                for die_data in json.loads(self.die_boundaries_json)
+            ]
         
         # Parse metadata
         metadata = None
@@ -285,22 +374,6 @@ class SchematicModel(Base):
     @classmethod
     def from_schematic_data(cls, data: SchematicData, created_by: str) -> 'SchematicModel':
         """Create database model from SchematicData domain object."""
-        # Serialize die boundaries
-        die_boundaries_data = []
-        for die in data.die_boundaries:
-            die_dict = {
-                'die_id': die.die_id,
-                'x_min': die.x_min,
-                'y_min': die.y_min,
-                'x_max': die.x_max,
-                'y_max': die.y_max,
-                'center_x': die.center_x,
-                'center_y': die.center_y,
-                'available': die.available,
-                'metadata': die.metadata
-            }
-            die_boundaries_data.append(die_dict)
-        
         # Serialize metadata
         metadata_json = None
         if data.metadata:
@@ -327,7 +400,8 @@ class SchematicModel(Base):
             upload_date=data.upload_date,
             coordinate_system=data.coordinate_system.value,
             wafer_size=data.wafer_size,
-            die_boundaries_json=json.dumps(die_boundaries_data),
+            die_boundaries_json="[]",
+            die_boundaries_blob=_pack_die_boundaries(data.die_boundaries),
             metadata_json=metadata_json,
             die_count=data.die_count,
             available_die_count=data.available_die_count,
@@ -371,6 +445,7 @@ class SchematicValidationModel(Base):
         Index('ix_schematic_validations_strategy_id', 'strategy_id'),
         Index('ix_schematic_validations_validation_date', 'validation_date'),
         Index('ix_schematic_validations_status', 'validation_status'),
+        Index('ix_schematic_validations_schematic_id_date', 'schematic_id', 'validation_date'),
     )
     
     def to_validation_result(self) -> SchematicValidationResult:
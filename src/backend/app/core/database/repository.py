@@ -30,64 +30,69 @@ class SQLAlchemyStrategyRepository(StrategyRepository):
     
     def save(self, definition: StrategyDefinition) -> StrategyVersion:
         """Save a strategy definition and return version info."""
+        return self.save_many([definition])[0]
+    
+    def save_many(self, definitions: List[StrategyDefinition]) -> List[StrategyVersion]:
+        """Save several strategy definitions in one transaction."""
         try:
-            # Check if strategy exists
-            existing = self.session.query(StrategyModel).filter(
-                StrategyModel.id == definition.id
-            ).first()
-            
-            if existing:
-                # Update existing strategy
-                db_strategy = StrategyModel.from_strategy_definition(definition)
-                for key, value in db_strategy.__dict__.items():
-                    if not key.startswith('_') and key != 'id':
-                        setattr(existing, key, value)
-                existing.modified_at = datetime.utcnow()
-                self.session.commit()
-                strategy_model = existing
-            else:
-                # Create new strategy
-                strategy_model = StrategyModel.from_strategy_definition(definition)
-                self.session.add(strategy_model)
-                self.session.commit()
-            
-            # Create version record
-            version = StrategyVersion(
-                strategy_id=definition.id,
-                version=definition.version,
-                definition=definition,
-                created_at=datetime.utcnow(),
-                created_by=definition.author,
-                is_active=(definition.lifecycle_state == StrategyLifecycle.ACTIVE)
-            )
-            
-            # Save version record to database
-            version_model = StrategyVersionModel(
-                strategy_id=definition.id,
-                version=definition.version,
-                created_at=version.created_at,
-                created_by=version.created_by,
-                changelog="",
-                is_active=version.is_active,
-                strategy_snapshot_json=json.dumps(definition.to_dict())
-            )
-            
-            # Remove old active version if this is active
-            if definition.lifecycle_state == StrategyLifecycle.ACTIVE:
-                self.session.query(StrategyVersionModel).filter(
-                    StrategyVersionModel.strategy_id == definition.id,
-                    StrategyVersionModel.is_active == True
-                ).update({StrategyVersionModel.is_active: False})
-            
-            self.session.add(version_model)
+            versions = [self._stage(definition) for definition in definitions]
             self.session.commit()
-            
-            return version
+            return versions
             
         except SQLAlchemyError as e:
             self.session.rollback()
             raise Exception(f"Database error saving strategy: {str(e)}")
     
+    def _stage(self, definition: StrategyDefinition) -> StrategyVersion:
+        """Add a definition and its version record to the session without committing."""
+        # Check if strategy exists
+        existing = self.session.query(StrategyModel).filter(
+            StrategyModel.id == definition.id
+        ).first()
+        
+        if existing:
+            # Update existing strategy
+            db_strategy = StrategyModel.from_strategy_definition(definition)
+            for key, value in db_strategy.__dict__.items():
+                if not key.startswith('_') and key != 'id':
+                    setattr(existing, key, value)
+            existing.modified_at = datetime.utcnow()
+        else:
+            # Create new strategy
+            self.session.add(StrategyModel.from_strategy_definition(definition))
+        
+        # Create version record
+        version = StrategyVersion(
+            strategy_id=definition.id,
+            version=definition.version,
+            definition=definition,
+            created_at=datetime.utcnow(),
+            created_by=definition.author,
+            is_active=(definition.lifecycle_state == StrategyLifecycle.ACTIVE)
+        )
+        
+        # Remove old active version if this is active
+        if definition.lifecycle_state == StrategyLifecycle.ACTIVE:
+            self.session.query(StrategyVersionModel).filter(
+                StrategyVersionModel.strategy_id == definition.id,
+                StrategyVersionModel.is_active == True
+            ).update({StrategyVersionModel.is_active: False})
+        
+        # Save version record to database; re-saving a version refreshes its snapshot
+        # since (strategy_id, version) is unique
+        version_model = self.session.query(StrategyVersionModel).filter(
+            StrategyVersionModel.strategy_id == definition.id,
+            StrategyVersionModel.version == definition.version
+        ).first()
+        if version_model is None:
+            version_model = StrategyVersionModel(strategy_id=definition.id, version=definition.version, changelog="")
+            self.session.add(version_model)
+        version_model.created_at = version.created_at
+        version_model.created_by = version.created_by
+        version_model.is_active = version.is_active
+        version_model.strategy_snapshot_json = json.dumps(definition.to_dict())
+        return version
+    
     def get_by_id(self, strategy_id: str, version: Optional[str] = None) -> Optional[StrategyDefinition]:
         """Get strategy by ID, optionally specific version."""
         try:
@@ -0,0 +1,83 @@
+"""
+Point-in-die classification kernel for the die-boundary grid index.
+
+When numba is installed the kernel is a JIT-compiled parallel loop that
+releases the GIL; otherwise it falls back to an equivalent NumPy version
+that tests one candidate slot per cell at a time.
+"""
+import numpy as np
+
+from .wafer_map import PACKABLE_MAX, PACKABLE_MIN, pack_coordinates
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, nogil=True)
+    def locate_points(px, py, origin_x, origin_y, cell_w, cell_h,
+                      cell_keys, cell_starts, cell_counts, cell_members,
+                      large, x_min, y_min, x_max, y_max):
+        """Index of the lowest die containing each point, or -1."""
+        out = np.full(px.size, -1, np.int64)
+        for p in prange(px.size):
+            x = px[p]
+            y = py[p]
+            best = -1
+            if cell_keys.size:
+                cx = np.int64(np.floor((x - origin_x) / cell_w))
+                cy = np.int64(np.floor((y - origin_y) / cell_h))
+                key = (cx << 32) | (cy & 0xFFFFFFFF)
+                pos = np.searchsorted(cell_keys, key)
+                if pos < cell_keys.size and cell_keys[pos] == key:
+                    start = cell_starts[pos]
+                    for k in range(start, start + cell_counts[pos]):
+                        j = cell_members[k]
+                        if x_min[j] <= x <= x_max[j] and y_min[j] <= y <= y_max[j]:
+                            best = j
+                            break
+            for j in large:
+                if (best < 0 or j < best) and x_min[j] <= x <= x_max[j] and y_min[j] <= y <= y_max[j]:
+                    best = j
+            out[p] = best
+        return out
+else:
+    def locate_points(px, py, origin_x, origin_y, cell_w, cell_h,
+                      cell_keys, cell_starts, cell_counts, cell_members,
+                      large, x_min, y_min, x_max, y_max):
+        """Index of the lowest die containing each point, or -1."""
+        out = np.full(px.size, -1, dtype=np.int64)
+
+        def contains(dies, xs, ys):
+            return (x_min[dies] <= xs) & (xs <= x_max[dies]) & (y_min[dies] <= ys) & (ys <= y_max[dies])
+
+        if cell_keys.size:
+            # Locate each point's cell, then test its candidates slot by slot
+            # Far-off points are clamped into the packable range; the containment test rejects them
+            cx = np.clip(np.floor((px - origin_x) / cell_w), PACKABLE_MIN, PACKABLE_MAX).astype(np.int64)
+            cy = np.clip(np.floor((py - origin_y) / cell_h), PACKABLE_MIN, PACKABLE_MAX).astype(np.int64)
+            keys = pack_coordinates(cx, cy)
+            pos = np.minimum(np.searchsorted(cell_keys, keys), cell_keys.size - 1)
+            counts = np.where(cell_keys[pos] == keys, cell_counts[pos], 0)
+            starts = cell_starts[pos]
+            for slot in range(int(counts.max(initial=0))):
+                pending = np.flatnonzero((counts > slot) & (out < 0))
+                candidates = cell_members[starts[pending] + slot]
+                inside = contains(candidates, px[pending], py[pending])
+                out[pending[inside]] = candidates[inside]
+
+        for j in large:
+            inside = contains(j, px, py) & ((out < 0) | (out > j))
+            out[inside] = j
+        return out
+
+
+def warm_up():
+    """Run the kernel once on tiny inputs so JIT compilation happens up front."""
+    empty_f = np.zeros(0, dtype=np.float64)
+    empty_i = np.zeros(0, dtype=np.int64)
+    locate_points(np.zeros(1), np.zeros(1), 0.0, 0.0, 1.0, 1.0,
+                  empty_i, empty_i, empty_i, empty_i, empty_i,
+                  empty_f, empty_f, empty_f, empty_f)
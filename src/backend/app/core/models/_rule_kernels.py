@@ -0,0 +1,37 @@
+"""
+Fixed-point membership kernel shared by FixedPointRule and its plugin.
+
+Die coordinates and target points are both packed into int64 keys (see
+pack_coordinates); the kernel marks each die whose key appears in the sorted,
+de-duplicated point keys. When numba is installed it is a JIT-compiled
+parallel binary search that releases the GIL; otherwise it falls back to
+np.isin.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, nogil=True)
+    def fixed_point_mask(keys, points):
+        """Mask of die keys present in the sorted unique point keys."""
+        out = np.zeros(keys.size, np.bool_)
+        if points.size == 0:
+            return out
+        for i in prange(keys.size):
+            pos = np.searchsorted(points, keys[i])
+            out[i] = pos < points.size and points[pos] == keys[i]
+        return out
+else:
+    def fixed_point_mask(keys, points):
+        """Mask of die keys present in the sorted unique point keys."""
+        return np.isin(keys, points, assume_unique=False)
+
+
+def warm_up():
+    """Run the kernel once on tiny inputs so JIT compilation happens up front."""
+    fixed_point_mask(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
@@ -0,0 +1,114 @@
+"""
+Point-lookup spatial index over schematic die boundaries.
+
+Boundaries are held as NumPy struct-of-arrays. When rtree is installed they
+are also bulk-loaded into a packed R-tree; otherwise they are bucketed into a
+uniform grid sized to the median die and stored CSR-style so whole batches
+of points can be resolved by the locate_points kernel. Either way a lookup
+returns the lowest-index boundary containing the point, matching the
+original first-match linear scan.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+from ._kernels import locate_points
+from .wafer_map import pack_coordinates
+
+try:
+    from rtree import index as rtree_index
+except ImportError:
+    rtree_index = None
+
+# Dies spanning more grid cells than this are checked on every lookup instead
+_MAX_CELLS_PER_DIE = 64
+
+
+class DieBoundaryIndex:
+    """Spatial index answering which die boundary contains a point."""
+
+    def __init__(self, boundaries: Sequence):
+        n = len(boundaries)
+        self.x_min = np.fromiter((d.x_min for d in boundaries), dtype=np.float64, count=n)
+        self.y_min = np.fromiter((d.y_min for d in boundaries), dtype=np.float64, count=n)
+        self.x_max = np.fromiter((d.x_max for d in boundaries), dtype=np.float64, count=n)
+        self.y_max = np.fromiter((d.y_max for d in boundaries), dtype=np.float64, count=n)
+        self.available = np.fromiter((d.available for d in boundaries), dtype=bool, count=n)
+        self._tree = None
+
+        if n and rtree_index is not None:
+            # Stream loading builds a packed tree in one pass
+            self._tree = rtree_index.Index(
+                (i, (d.x_min, d.y_min, d.x_max, d.y_max), None)
+                for i, d in enumerate(boundaries)
+            )
+        else:
+            self._build_grid()
+
+    def __len__(self) -> int:
+        return self.x_min.size
+
+    def _build_grid(self):
+        """Bucket boundaries into grid cells stored as sorted keys plus a flat member array."""
+        n = len(self)
+        self._origin_x = float(self.x_min.min()) if n else 0.0
+        self._origin_y = float(self.y_min.min()) if n else 0.0
+        self._cell_w = float(np.median(self.x_max - self.x_min)) if n else 1.0
+        self._cell_h = float(np.median(self.y_max - self.y_min)) if n else 1.0
+        self._cell_w = self._cell_w or 1.0
+        self._cell_h = self._cell_h or 1.0
+
+        cx0, cy0 = self._cells(self.x_min, self.y_min)
+        cx1, cy1 = self._cells(self.x_max, self.y_max)
+        spans_x = cx1 - cx0 + 1
+        spans_y = cy1 - cy0 + 1
+        large = spans_x * spans_y > _MAX_CELLS_PER_DIE
+        self._large = np.flatnonzero(large)
+
+        # Expand each remaining die into one (cell, die) entry per covered cell
+        small = np.flatnonzero(~large)
+        per_die = spans_x[small] * spans_y[small]
+        members = np.repeat(small, per_die)
+        offset = np.arange(members.size) - np.repeat(np.cumsum(per_die) - per_die, per_die)
+        width = np.repeat(spans_x[small], per_die)
+        keys = pack_coordinates(cx0[members] + offset % width, cy0[members] + offset // width)
+
+        # Sort by cell, then die index so the first hit in a cell is the lowest index
+        order = np.lexsort((members, keys))
+        keys = keys[order]
+        self._cell_members = members[order]
+        self._cell_keys, self._cell_starts, self._cell_counts = np.unique(
+            keys, return_index=True, return_counts=True
+        )
+
+    def _cells(self, xs: np.ndarray, ys: np.ndarray):
+        """Grid cell coordinates of the given points."""
+        cx = np.floor((xs - self._origin_x) / self._cell_w).astype(np.int64)
+        cy = np.floor((ys - self._origin_y) / self._cell_h).astype(np.int64)
+        return cx, cy
+
+    def find_many(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Index of the first boundary containing each point, or -1."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        out = np.full(xs.size, -1, dtype=np.int64)
+        if not len(self) or not xs.size:
+            return out
+
+        if self._tree is not None:
+            for p, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+                candidates = [i for i in self._tree.intersection((x, y, x, y))
+                              if self.x_min[i] <= x <= self.x_max[i]
+                              and self.y_min[i] <= y <= self.y_max[i]]
+                if candidates:
+                    out[p] = min(candidates)
+            return out
+
+        return locate_points(xs, ys, self._origin_x, self._origin_y, self._cell_w, self._cell_h,
+                             self._cell_keys, self._cell_starts, self._cell_counts, self._cell_members,
+                             self._large, self.x_min, self.y_min, self.x_max, self.y_max)
+
+    def find(self, x: float, y: float) -> Optional[int]:
+        """Index of the first boundary containing (x, y), or None."""
+        i = int(self.find_many(np.array([x]), np.array([y]))[0])
+        return None if i < 0 else i
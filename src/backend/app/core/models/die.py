@@ -1,5 +1,50 @@
+from typing import Iterable, List
+
+
 class Die:
+    __slots__ = ("x", "y", "available")
+
     def __init__(self, x: int, y: int, available: bool = True):
         self.x = x
         self.y = y
         self.available = available
+
+    @classmethod
+    def bulk(cls, xs: Iterable[int], ys: Iterable[int], available: Iterable[bool]) -> List["Die"]:
+        """Build many dies at once, bypassing per-instance __init__ dispatch."""
+        new = object.__new__
+        dies = []
+        append = dies.append
+        retype = cls is not Die
+        for x, y, a in zip(xs, ys, available):
+            die = new(Die)
+            die.x = x
+            die.y = y
+            die.available = a
+            if retype:
+                # Subclasses may forbid writes, so fill the shared slots as a plain Die first
+                die.__class__ = cls
+            append(die)
+        return dies
+
+
+class MapDie(Die):
+    """Die materialized from a WaferMap's arrays; it is read-only because writes would never reach the map."""
+    __slots__ = ()
+
+    def __init__(self, x: int, y: int, available: bool = True):
+        _set_x(self, x)
+        _set_y(self, y)
+        _set_available(self, available)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Die.{name} is read-only here; use WaferMap.set_available to change the map")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Die.{name} is read-only here")
+
+
+# Slot setters that bypass MapDie.__setattr__
+_set_x = Die.x.__set__
+_set_y = Die.y.__set__
+_set_available = Die.available.__set__
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from .wafer_map import WaferMap
+from .wafer_map import PACKABLE_MAX, PACKABLE_MIN, WaferMap, pack_coordinates
 from .die import Die
+from ._rule_kernels import fixed_point_mask
 from typing import List
+import numpy as np
+
+# Point sets whose bounding box has at most this many cells get a dense lookup grid
+_DENSE_MAX_CELLS = 1 << 16
 
 class Rule(ABC):
     @abstractmethod
@@ -11,6 +16,32 @@ class Rule(ABC):
 class FixedPointRule(Rule):
     def __init__(self, points: List[tuple]):
         self.points = points
+        # Non-integral points can never match a die
+        integral = [(int(x), int(y)) for x, y in points if x == int(x) and y == int(y)]
+        # Points outside the packable range are dropped; dies out there cannot be packed either
+        packable = [(x, y) for x, y in integral
+                    if PACKABLE_MIN <= x <= PACKABLE_MAX and PACKABLE_MIN <= y <= PACKABLE_MAX]
+        xs = np.fromiter((x for x, _ in packable), dtype=np.int64, count=len(packable))
+        ys = np.fromiter((y for _, y in packable), dtype=np.int64, count=len(packable))
+        self._packed_points = np.unique(pack_coordinates(xs, ys))
+
+        # Compact point sets become a boolean grid so membership is a single array index
+        self._grid = None
+        if packable:
+            self._grid_origin = (int(xs.min()), int(ys.min()))
+            width = int(xs.max()) - self._grid_origin[0] + 1
+            height = int(ys.max()) - self._grid_origin[1] + 1
+            if width * height <= _DENSE_MAX_CELLS:
+                self._grid = np.zeros((width, height), dtype=bool)
+                self._grid[xs - self._grid_origin[0], ys - self._grid_origin[1]] = True
 
     def apply(self, wafer_map: WaferMap) -> List[Die]:
-        return [die for die in wafer_map.dies if (die.x, die.y) in self.points]
+        if self._grid is None:
+            return wafer_map.select(fixed_point_mask(wafer_map.packed_coords, self._packed_points))
+
+        gx = wafer_map.xs - self._grid_origin[0]
+        gy = wafer_map.ys - self._grid_origin[1]
+        inside = (gx >= 0) & (gx < self._grid.shape[0]) & (gy >= 0) & (gy < self._grid.shape[1])
+        mask = np.zeros(gx.size, dtype=bool)
+        mask[inside] = self._grid[gx[inside], gy[inside]]
+        return wafer_map.select(mask)
@@ -8,6 +8,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
+from ._spatial import DieBoundaryIndex
 from .die import Die
 from .wafer_map import WaferMap
 
@@ -113,6 +116,10 @@ class SchematicData:
     # Computed properties
     _die_count: Optional[int] = None
     _layout_bounds: Optional[Tuple[float, float, float, float]] = None
+    _spatial_index: Optional[DieBoundaryIndex] = field(default=None, repr=False, compare=False)
+    _spatial_index_key: Optional[Tuple[int, int]] = field(default=None, repr=False, compare=False)
+    _wafer_map: Optional[WaferMap] = field(default=None, repr=False, compare=False)
+    _wafer_map_key: Optional[Tuple[int, int]] = field(default=None, repr=False, compare=False)
     
     @property
     def die_count(self) -> int:
@@ -135,17 +142,42 @@ class SchematicData:
             self._layout_bounds = (min(x_coords), min(y_coords), max(x_coords), max(y_coords))
         return self._layout_bounds or (0, 0, 0, 0)
     
+    @property
+    def spatial_index(self) -> DieBoundaryIndex:
+        """Get the die boundary spatial index, rebuilding it when the list is replaced or resized."""
+        key = (id(self.die_boundaries), len(self.die_boundaries))
+        if self._spatial_index is None or self._spatial_index_key != key:
+            self._spatial_index = DieBoundaryIndex(self.die_boundaries)
+            self._spatial_index_key = key
+        return self._spatial_index
+    
+    def invalidate_spatial_index(self):
+        """Drop the spatial index and wafer map; call after editing die boundaries in place."""
+        self._spatial_index = None
+        self._wafer_map = None
+    
     def get_die_at_coordinates(self, x: float, y: float) -> Optional[DieBoundary]:
         """Find die boundary containing the given coordinates."""
-        for die in self.die_boundaries:
-            if die.contains_point(x, y):
-                return die
-        return None
+        i = self.spatial_index.find(x, y)
+        return None if i is None else self.die_boundaries[i]
+    
+    def get_die_indices(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Find the index of the die boundary containing each point, or -1."""
+        return self.spatial_index.find_many(xs, ys)
     
     def to_wafer_map(self) -> WaferMap:
-        """Convert schematic data to WaferMap for strategy processing."""
-        dies = [die_boundary.to_die() for die_boundary in self.die_boundaries]
-        return WaferMap(dies)
+        """Convert schematic data to WaferMap for strategy processing, reusing the last conversion."""
+        key = (id(self.die_boundaries), len(self.die_boundaries))
+        if self._wafer_map is None or self._wafer_map_key != key:
+            # Same truncation as DieBoundary.to_die, built straight into the wafer map's arrays
+            n = len(self.die_boundaries)
+            self._wafer_map = WaferMap.from_arrays(
+                np.fromiter((d.center_x for d in self.die_boundaries), dtype=np.float64, count=n).astype(np.int64),
+                np.fromiter((d.center_y for d in self.die_boundaries), dtype=np.float64, count=n).astype(np.int64),
+                np.fromiter((d.available for d in self.die_boundaries), dtype=bool, count=n)
+            )
+            self._wafer_map_key = key
+        return self._wafer_map
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get comprehensive statistics about the schematic."""
@@ -205,7 +237,7 @@ class SchematicData:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationConflict:
     """Represents a conflict between strategy and schematic data."""
     conflict_type: str  # "out_of_bounds", "misaligned", "unavailable_die"
@@ -249,15 +281,33 @@ class SchematicValidationResult:
     # Recommendations
     recommendations: List[str] = field(default_factory=list)
     
+    # Conflict severity counts, maintained by add_conflict
+    _error_count: int = field(default=0, init=False, repr=False, compare=False)
+    _conflict_warning_count: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._error_count = sum(1 for c in self.conflicts if c.severity == "error")
+        self._conflict_warning_count = sum(1 for c in self.conflicts if c.severity == "warning")
+    
+    @property
+    def error_count(self) -> int:
+        """Get number of error-severity conflicts."""
+        return self._error_count
+    
+    @property
+    def warning_count(self) -> int:
+        """Get number of warnings plus warning-severity conflicts."""
+        return len(self.warnings) + self._conflict_warning_count
+    
     @property
     def has_errors(self) -> bool:
         """Check if validation has any errors."""
-        return any(conflict.severity == "error" for conflict in self.conflicts)
+        return self._error_count > 0
     
     @property
     def has_warnings(self) -> bool:
         """Check if validation has any warnings."""
-        return len(self.warnings) > 0 or any(conflict.severity == "warning" for conflict in self.conflicts)
+        return self.warning_count > 0
     
     @property
     def is_valid(self) -> bool:
@@ -276,7 +326,21 @@ class SchematicValidationResult:
             recommendation=recommendation,
             affected_die_id=affected_die_id
         )
-        self.conflicts.append(conflict)
+        self.add_conflicts([conflict])
+    
+    def add_conflicts(self, conflicts: List[ValidationConflict]):
+        """Add a batch of prebuilt validation conflicts."""
+        self.conflicts.extend(conflicts)
+        for conflict in conflicts:
+            if conflict.severity == "error":
+                self._error_count += 1
+            elif conflict.severity == "warning":
+                self._conflict_warning_count += 1
+    
+    def add_unlisted_conflicts(self, error_count: int, warning_count: int):
+        """Count conflicts that were found but not materialized (e.g. past a storage cap)."""
+        self._error_count += error_count
+        self._conflict_warning_count += warning_count
     
     def add_warning(self, warning_type: str, description: str, 
                    affected_area: Tuple[float, float, float, float] = None,
@@ -298,9 +362,8 @@ class SchematicValidationResult:
         base_score = self.valid_strategy_points / self.total_strategy_points
         
         # Penalize for errors and warnings
-        error_penalty = len([c for c in self.conflicts if c.severity == "error"]) * 0.1
-        warning_penalty = len([c for c in self.conflicts if c.severity == "warning"]) * 0.05
-        warning_penalty += len(self.warnings) * 0.05
+        error_penalty = self._error_count * 0.1
+        warning_penalty = self.warning_count * 0.05
         
         final_score = max(0.0, base_score - error_penalty - warning_penalty)
         self.alignment_score = round(final_score, 3)
@@ -317,8 +380,8 @@ class SchematicValidationResult:
             "coverage_percentage": self.coverage_percentage,
             "total_points": self.total_strategy_points,
             "valid_points": self.valid_strategy_points,
-            "error_count": len([c for c in self.conflicts if c.severity == "error"]),
-            "warning_count": len(self.warnings) + len([c for c in self.conflicts if c.severity == "warning"]),
+            "error_count": self.error_count,
+            "warning_count": self.warning_count,
             "is_valid": self.is_valid,
             "recommendations": self.recommendations
         }
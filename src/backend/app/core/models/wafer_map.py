@@ -1,9 +1,118 @@
-from typing import List
-from .die import Die
+from functools import cached_property
+from itertools import repeat
+from typing import Iterator, List, Sequence, Union, overload
+import numpy as np
+from .die import Die, MapDie
+
+# Range each coordinate must fit in for packed keys to stay collision-free
+PACKABLE_MIN = -(1 << 31)
+PACKABLE_MAX = (1 << 31) - 1
+
+def pack_coordinates(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Pack int32-range (x, y) pairs into single int64 keys as (x << 32) | y; wider values raise ValueError."""
+    xs = np.asarray(xs).astype(np.int64, copy=False)
+    ys = np.asarray(ys).astype(np.int64, copy=False)
+    for coords in (xs, ys):
+        if coords.size and (coords.min() < PACKABLE_MIN or coords.max() > PACKABLE_MAX):
+            raise ValueError("Coordinates outside the int32 range cannot be packed into unique keys")
+    return (xs << 32) | (ys & 0xFFFFFFFF)
+
+def _integral_coordinates(values: List, axis: str) -> np.ndarray:
+    """int64 array of die coordinates; fractional, non-finite or non-numeric values raise ValueError."""
+    coords = np.asarray(values)
+    if coords.dtype.kind in "iu":
+        return coords.astype(np.int64, copy=False)
+    if coords.dtype.kind == "f" and np.isfinite(coords).all() and (coords == np.floor(coords)).all() \
+            and (np.abs(coords) < 2.0 ** 63).all():
+        return coords.astype(np.int64)
+    raise ValueError(f"Die {axis} coordinates must be integers")
+
+class DieView(Sequence[Die]):
+    """Read-only sequence of Die objects materialized on access from WaferMap's arrays."""
+    __slots__ = ("_xs", "_ys", "_available")
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, available: np.ndarray):
+        self._xs = xs
+        self._ys = ys
+        self._available = available
+
+    def __len__(self) -> int:
+        return self._xs.size
+
+    @overload
+    def __getitem__(self, index: int) -> Die: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Die]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Die, List[Die]]:
+        if isinstance(index, slice):
+            return MapDie.bulk(self._xs[index].tolist(), self._ys[index].tolist(),
+                               self._available[index].tolist())
+        return MapDie(int(self._xs[index]), int(self._ys[index]), bool(self._available[index]))
+
+    def __iter__(self) -> Iterator[Die]:
+        for x, y, a in zip(self._xs.tolist(), self._ys.tolist(), self._available.tolist()):
+            yield MapDie(x, y, a)
 
 class WaferMap:
-    def __init__(self, dies: List[Die]):
+    """Wafer die layout stored as parallel coordinate and availability arrays."""
+
+    def __init__(self, dies: Sequence[Die]):
         self.dies = dies
 
+    @classmethod
+    def from_arrays(cls, xs: np.ndarray, ys: np.ndarray, available: np.ndarray) -> "WaferMap":
+        """Build a wafer map directly from coordinate and availability arrays."""
+        wafer_map = cls.__new__(cls)
+        wafer_map._set_arrays(np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64),
+                              np.asarray(available, dtype=bool))
+        return wafer_map
+
+    @property
+    def dies(self) -> DieView:
+        return DieView(self.xs, self.ys, self.available_mask)
+
+    @dies.setter
+    def dies(self, dies: Sequence[Die]):
+        n = len(dies)
+        self._set_arrays(_integral_coordinates([die.x for die in dies], "x"),
+                         _integral_coordinates([die.y for die in dies], "y"),
+                         np.fromiter((die.available for die in dies), dtype=bool, count=n))
+
+    def _set_arrays(self, xs: np.ndarray, ys: np.ndarray, available: np.ndarray):
+        self.xs = xs
+        self.ys = ys
+        self.available_mask = available
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop derived arrays; call after writing to xs, ys or available_mask in place."""
+        self.__dict__.pop("packed_coords", None)
+        self.__dict__.pop("available_count", None)
+
+    @cached_property
+    def packed_coords(self) -> np.ndarray:
+        return pack_coordinates(self.xs, self.ys)
+
+    @property
+    def die_count(self) -> int:
+        """Number of dies on the map, read straight from the coordinate arrays."""
+        return self.xs.size
+
+    @cached_property
+    def available_count(self) -> int:
+        """Number of available dies, counted without materializing Die objects."""
+        return int(np.count_nonzero(self.available_mask))
+
+    def set_available(self, index: int, available: bool):
+        """Mark the die at an index available or not; dies read from the map are read-only."""
+        self.available_mask[index] = available
+        self.invalidate()
+
+    def select(self, mask: np.ndarray) -> List[Die]:
+        """Dies where a boolean mask over this map is set, in map order."""
+        return MapDie.bulk(self.xs[mask].tolist(), self.ys[mask].tolist(), self.available_mask[mask].tolist())
+
     def get_available_dies(self) -> List[Die]:
-        return [die for die in self.dies if die.available]
+        mask = self.available_mask
+        return MapDie.bulk(self.xs[mask].tolist(), self.ys[mask].tolist(), repeat(True))
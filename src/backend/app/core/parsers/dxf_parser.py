@@ -5,6 +5,7 @@ DXF (Drawing Exchange Format) is a CAD data file format used for
 2D and 3D design data and metadata. This parser extracts die boundaries
 and coordinate information for wafer sampling strategy validation.
 """
+import math
 import uuid
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
@@ -468,12 +469,23 @@ class DXFParser:
         if not boundaries:
             return None
         
-        # Calculate overall layout dimensions
-        x_coords = [b.center_x for b in boundaries]
-        y_coords = [b.center_y for b in boundaries]
+        # Calculate overall layout dimensions in a single pass
+        x_min = y_min = math.inf
+        x_max = y_max = -math.inf
+        for b in boundaries:
+            cx = b.center_x
+            cy = b.center_y
+            if cx < x_min:
+                x_min = cx
+            if cx > x_max:
+                x_max = cx
+            if cy < y_min:
+                y_min = cy
+            if cy > y_max:
+                y_max = cy
         
-        layout_width = max(x_coords) - min(x_coords)
-        layout_height = max(y_coords) - min(y_coords)
+        layout_width = x_max - x_min
+        layout_height = y_max - y_min
         layout_diameter = max(layout_width, layout_height)
         
         # Estimate wafer size based on layout diameter (assuming mm units)
@@ -330,23 +330,25 @@ class KLASPECParser(FormatParser):
             
             strategy_name = root.get("name", filename)
             
-            rules = []
-            for site in root.findall(".//Site"):
+            sites = root.findall(".//Site")
+            points = []
+            for site in sites:
                 x = int(site.find("X_Position").text)
                 y = int(site.find("Y_Position").text)
                 enabled = site.find("Enabled").text.lower() == "true"
                 
-                # Convert to FixedPoint rule
-                if not rules or rules[0].rule_type != "fixed_point":
-                    rules.append(RuleConfig(
-                        rule_type="fixed_point",
-                        parameters={"points": []},
-                        weight=1.0,
-                        enabled=True
-                    ))
-                
                 if enabled:
-                    rules[0].parameters["points"].append([x, y])
+                    points.append([x, y])
+            
+            # Convert sites to a single FixedPoint rule; configs are immutable, so build it once
+            rules = []
+            if sites:
+                rules.append(RuleConfig(
+                    rule_type="fixed_point",
+                    parameters={"points": points},
+                    weight=1.0,
+                    enabled=True
+                ))
             
             strategy = StrategyDefinition(
                 name=strategy_name,
@@ -5,6 +5,7 @@ GDSII is a binary format used for describing planar geometric shapes,
 text labels, and other information about integrated circuits.
 This parser extracts die boundaries for wafer sampling strategy validation.
 """
+import math
 import uuid
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
@@ -318,12 +319,23 @@ class GDSIIParser:
         if not boundaries:
             return None
         
-        # Calculate overall layout dimensions
-        x_coords = [b.center_x for b in boundaries]
-        y_coords = [b.center_y for b in boundaries]
-        
-        layout_width = max(x_coords) - min(x_coords)
-        layout_height = max(y_coords) - min(y_coords)
+        # Calculate overall layout dimensions in a single pass
+        x_min = y_min = math.inf
+        x_max = y_max = -math.inf
+        for b in boundaries:
+            cx = b.center_x
+            cy = b.center_y
+            if cx < x_min:
+                x_min = cx
+            if cx > x_max:
+                x_max = cx
+            if cy < y_min:
+                y_min = cy
+            if cy > y_max:
+                y_max = cy
+        
+        layout_width = x_max - x_min
+        layout_height = y_max - y_min
         layout_diameter = max(layout_width, layout_height)
         
         # Estimate wafer size based on layout diameter (in mm, assuming typical scaling)
@@ -5,8 +5,10 @@ SVG (Scalable Vector Graphics) is an XML-based vector image format
 that can contain 2D graphics. This parser extracts die boundaries
 from SVG representations of wafer layouts.
 """
+import math
 import uuid
 import xml.etree.ElementTree as ET
+import xml.parsers.expat
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -25,6 +27,12 @@ from ..models.schematic import (
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per step when sniffing the root element in validate_file
+_SNIFF_CHUNK_SIZE = 4096
+
+# Bytes fed to expat per step when scanning a document in parse_file
+_PARSE_CHUNK_SIZE = 64 * 1024
+
 
 class SVGParser:
     """Parser for SVG files to extract die boundaries."""
@@ -66,15 +74,14 @@ class SVGParser:
         logger.info(f"Parsing SVG file: {file_path}")
         
         try:
-            # Parse XML structure
-            tree = ET.parse(str(file_path))
-            root = tree.getroot()
+            # Stream the XML structure without building an element tree
+            scan = self._scan_file(file_path, **kwargs)
             
             # Extract metadata
-            metadata = self._extract_metadata(file_path, root)
+            metadata = self._extract_metadata(file_path, scan)
             
             # Extract die boundaries
-            die_boundaries = self._extract_die_boundaries(root, **kwargs)
+            die_boundaries = self._extract_die_boundaries(scan, **kwargs)
             
             # Validate and process boundaries
             die_boundaries = self._process_boundaries(die_boundaries, **kwargs)
@@ -96,41 +103,43 @@ class SVGParser:
             logger.error(f"Error parsing SVG file {file_path}: {str(e)}")
             raise ValueError(f"Failed to parse SVG file: {str(e)}")
     
-    def _extract_metadata(self, file_path: Path, root: ET.Element) -> SchematicMetadata:
+    def _scan_file(self, file_path: Path, **kwargs) -> '_SVGScan':
+        """Stream an SVG file through expat and collect die candidates."""
+        scan = _SVGScan(self, kwargs.get('target_layer'))
+        
+        expat_parser = xml.parsers.expat.ParserCreate(namespace_separator='|')
+        expat_parser.buffer_text = True
+        expat_parser.StartElementHandler = scan.start_element
+        expat_parser.EndElementHandler = scan.end_element
+        expat_parser.CharacterDataHandler = scan.character_data
+        
+        # Feed in chunks so memory stays flat regardless of file size
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(_PARSE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                expat_parser.Parse(chunk, False)
+        expat_parser.Parse(b'', True)
+        
+        return scan
+    
+    def _extract_metadata(self, file_path: Path, scan: '_SVGScan') -> SchematicMetadata:
         """Extract metadata from SVG file and root element."""
         file_stats = file_path.stat()
         
         # Extract SVG document information
-        svg_info = {}
-        try:
-            # Get viewBox and dimensions
-            viewbox = root.get('viewBox', '')
-            width = root.get('width', '')
-            height = root.get('height', '')
-            
-            # Extract title and description
-            title_elem = root.find('.//svg:title', self.svg_ns)
-            desc_elem = root.find('.//svg:desc', self.svg_ns)
-            
-            svg_info = {
-                'viewBox': viewbox,
-                'width': width,
-                'height': height,
-                'title': title_elem.text if title_elem is not None else None,
-                'description': desc_elem.text if desc_elem is not None else None,
-                'element_count': len(list(root.iter())),
-                'namespaces': dict(root.attrib) if hasattr(root, 'attrib') else {}
-            }
-            
-            # Count different element types
-            element_counts = {}
-            for elem in root.iter():
-                tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-                element_counts[tag] = element_counts.get(tag, 0) + 1
-            svg_info['element_counts'] = element_counts
-            
-        except Exception as e:
-            logger.warning(f"Could not extract full SVG metadata: {e}")
+        root_attrs = scan.root_attrs
+        svg_info = {
+            'viewBox': root_attrs.get('viewBox', ''),
+            'width': root_attrs.get('width', ''),
+            'height': root_attrs.get('height', ''),
+            'title': scan.document_text.get('title'),
+            'description': scan.document_text.get('desc'),
+            'element_count': sum(scan.element_counts.values()),
+            'namespaces': dict(root_attrs),
+            'element_counts': scan.element_counts
+        }
         
         return SchematicMetadata(
             original_filename=file_path.name,
@@ -143,41 +152,33 @@ class SVGParser:
             custom_attributes={}
         )
     
-    def _extract_die_boundaries(self, root: ET.Element, **kwargs) -> List[DieBoundary]:
+    def _extract_die_boundaries(self, scan: '_SVGScan', **kwargs) -> List[DieBoundary]:
         """Extract die boundaries from SVG elements."""
         die_boundaries = []
         coordinate_scale = kwargs.get('coordinate_scale', 1.0)
-        target_layer = kwargs.get('target_layer')
         
         # Method 1: Extract from shape elements (rect, circle, etc.)
-        boundaries_from_shapes = self._extract_from_shapes(root, coordinate_scale, target_layer)
+        boundaries_from_shapes = self._extract_from_shapes(scan.shapes, coordinate_scale)
         die_boundaries.extend(boundaries_from_shapes)
         
         # Method 2: Extract from text elements that might indicate die positions
-        boundaries_from_text = self._extract_from_text(root, coordinate_scale, target_layer)
+        boundaries_from_text = self._extract_from_text(scan.texts, coordinate_scale)
         die_boundaries.extend(boundaries_from_text)
         
         # Method 3: Extract from grouped elements and symbols
-        boundaries_from_groups = self._extract_from_groups(root, coordinate_scale, target_layer)
+        boundaries_from_groups = self._extract_from_groups(scan.groups, coordinate_scale)
         die_boundaries.extend(boundaries_from_groups)
         
         return die_boundaries
     
-    def _extract_from_shapes(self, root: ET.Element, scale: float, target_layer: Optional[str]) -> List[DieBoundary]:
+    def _extract_from_shapes(self, shapes: Dict[str, List[Tuple[Dict[str, str], Tuple]]],
+                             scale: float) -> List[DieBoundary]:
         """Extract die boundaries from shape elements."""
         boundaries = []
         die_counter = 0
         
-        for shape_type in self.die_detection_config['target_shapes']:
-            for elem in root.iter(f'{{{self.svg_ns["svg"]}}}{shape_type}'):
-                # Filter by layer/group if specified
-                if target_layer and not self._is_in_target_layer(elem, target_layer):
-                    continue
-                
-                bbox = self._get_element_bounding_box(elem)
-                if bbox is None:
-                    continue
-                
+        for shape_type, candidates in shapes.items():
+            for attrs, bbox in candidates:
                 width = (bbox[1][0] - bbox[0][0]) * scale
                 height = (bbox[1][1] - bbox[0][1]) * scale
                 
@@ -190,7 +191,7 @@ class SVGParser:
                     center_y = (bbox[0][1] + bbox[1][1]) / 2 * scale
                     
                     # Extract element attributes
-                    element_id = elem.get('id', f'{shape_type}_{die_counter}')
+                    element_id = attrs.get('id', f'{shape_type}_{die_counter}')
                     
                     boundary = DieBoundary(
                         die_id=element_id,
@@ -204,8 +205,8 @@ class SVGParser:
                         metadata={
                             'element_type': shape_type,
                             'element_id': element_id,
-                            'class': elem.get('class'),
-                            'style': elem.get('style'),
+                            'class': attrs.get('class'),
+                            'style': attrs.get('style'),
                             'source': 'shape_detection'
                         }
                     )
@@ -213,21 +214,17 @@ class SVGParser:
         
         return boundaries
     
-    def _extract_from_text(self, root: ET.Element, scale: float, target_layer: Optional[str]) -> List[DieBoundary]:
+    def _extract_from_text(self, texts: Dict[str, List[List[Any]]], scale: float) -> List[DieBoundary]:
         """Extract die positions from text elements."""
         boundaries = []
         
-        for text_type in self.die_detection_config['text_elements']:
-            for elem in root.iter(f'{{{self.svg_ns["svg"]}}}{text_type}'):
-                # Filter by layer/group if specified
-                if target_layer and not self._is_in_target_layer(elem, target_layer):
-                    continue
-                
+        for text_type, candidates in texts.items():
+            for attrs, text in candidates:
                 try:
                     # Get text position
-                    x = float(elem.get('x', 0))
-                    y = float(elem.get('y', 0))
-                    text_content = elem.text or ''
+                    x = float(attrs.get('x', 0))
+                    y = float(attrs.get('y', 0))
+                    text_content = text or ''
                     
                     # Check if text matches die ID patterns
                     is_die_id = any(re.search(pattern, text_content.lower()) 
@@ -237,7 +234,7 @@ class SVGParser:
                         pos_x, pos_y = x * scale, y * scale
                         
                         # Estimate die size based on font size or use default
-                        font_size = self._extract_font_size(elem)
+                        font_size = self._extract_font_size(attrs)
                         estimated_size = max(font_size * 2, 10.0) * scale
                         half_size = estimated_size / 2
                         
@@ -254,7 +251,7 @@ class SVGParser:
                                 'source': 'text_detection',
                                 'original_text': text_content,
                                 'font_size': font_size,
-                                'element_id': elem.get('id')
+                                'element_id': attrs.get('id')
                             }
                         )
                         boundaries.append(boundary)
@@ -265,19 +262,15 @@ class SVGParser:
         
         return boundaries
     
-    def _extract_from_groups(self, root: ET.Element, scale: float, target_layer: Optional[str]) -> List[DieBoundary]:
+    def _extract_from_groups(self, groups: Dict[str, List['_GroupCandidate']], scale: float) -> List[DieBoundary]:
         """Extract die boundaries from grouped elements and symbols."""
         boundaries = []
         die_counter = 0
         
-        for group_type in self.die_detection_config['group_elements']:
-            for elem in root.iter(f'{{{self.svg_ns["svg"]}}}{group_type}'):
-                # Filter by layer/group if specified
-                if target_layer and not self._is_in_target_layer(elem, target_layer):
-                    continue
-                
-                # Calculate bounding box for the entire group
-                bbox = self._get_group_bounding_box(elem)
+        for group_type, candidates in groups.items():
+            for group in candidates:
+                # Bounding box of the entire group, folded from its children
+                bbox = group.bounding_box()
                 if bbox is None:
                     continue
                 
@@ -292,7 +285,7 @@ class SVGParser:
                     center_x = (bbox[0][0] + bbox[1][0]) / 2 * scale
                     center_y = (bbox[0][1] + bbox[1][1]) / 2 * scale
                     
-                    element_id = elem.get('id', f'{group_type}_{die_counter}')
+                    element_id = group.attrs.get('id', f'{group_type}_{die_counter}')
                     
                     boundary = DieBoundary(
                         die_id=element_id,
@@ -306,42 +299,40 @@ class SVGParser:
                         metadata={
                             'element_type': group_type,
                             'element_id': element_id,
-                            'class': elem.get('class'),
+                            'class': group.attrs.get('class'),
                             'source': 'group_detection',
-                            'child_count': len(list(elem))
+                            'child_count': group.child_count
                         }
                     )
                     boundaries.append(boundary)
         
         return boundaries
     
-    def _get_element_bounding_box(self, elem: ET.Element) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
-        """Get bounding box for an SVG element."""
+    def _get_element_bounding_box(self, tag: str, attrs: Dict[str, str]) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """Get bounding box for an SVG element from its local tag name and attributes."""
         try:
-            tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-            
             if tag == 'rect':
-                x = float(elem.get('x', 0))
-                y = float(elem.get('y', 0))
-                width = float(elem.get('width', 0))
-                height = float(elem.get('height', 0))
+                x = float(attrs.get('x', 0))
+                y = float(attrs.get('y', 0))
+                width = float(attrs.get('width', 0))
+                height = float(attrs.get('height', 0))
                 return ((x, y), (x + width, y + height))
             
             elif tag == 'circle':
-                cx = float(elem.get('cx', 0))
-                cy = float(elem.get('cy', 0))
-                r = float(elem.get('r', 0))
+                cx = float(attrs.get('cx', 0))
+                cy = float(attrs.get('cy', 0))
+                r = float(attrs.get('r', 0))
                 return ((cx - r, cy - r), (cx + r, cy + r))
             
             elif tag == 'ellipse':
-                cx = float(elem.get('cx', 0))
-                cy = float(elem.get('cy', 0))
-                rx = float(elem.get('rx', 0))
-                ry = float(elem.get('ry', 0))
+                cx = float(attrs.get('cx', 0))
+                cy = float(attrs.get('cy', 0))
+                rx = float(attrs.get('rx', 0))
+                ry = float(attrs.get('ry', 0))
                 return ((cx - rx, cy - ry), (cx + rx, cy + ry))
             
             elif tag == 'polygon' or tag == 'polyline':
-                points_str = elem.get('points', '')
+                points_str = attrs.get('points', '')
                 points = self._parse_points(points_str)
                 if points:
                     x_coords = [p[0] for p in points]
@@ -350,7 +341,7 @@ class SVGParser:
             
             elif tag == 'path':
                 # Simple path parsing - could be enhanced for complex paths
-                d = elem.get('d', '')
+                d = attrs.get('d', '')
                 bbox = self._parse_path_bbox(d)
                 return bbox
             
@@ -359,30 +350,6 @@ class SVGParser:
         
         return None
     
-    def _get_group_bounding_box(self, group: ET.Element) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
-        """Calculate bounding box for a group of elements."""
-        try:
-            x_coords, y_coords = [], []
-            
-            # Apply group transformation if any
-            transform = group.get('transform', '')
-            
-            for child in group:
-                bbox = self._get_element_bounding_box(child)
-                if bbox:
-                    # Apply transformation if needed (simplified)
-                    # TODO: Implement full SVG transformation parsing
-                    x_coords.extend([bbox[0][0], bbox[1][0]])
-                    y_coords.extend([bbox[0][1], bbox[1][1]])
-            
-            if x_coords and y_coords:
-                return ((min(x_coords), min(y_coords)), (max(x_coords), max(y_coords)))
-            
-        except Exception as e:
-            logger.warning(f"Error calculating group bounding box: {e}")
-        
-        return None
-    
     def _parse_points(self, points_str: str) -> List[Tuple[float, float]]:
         """Parse SVG points attribute."""
         points = []
@@ -409,16 +376,16 @@ class SVGParser:
             pass
         return None
     
-    def _extract_font_size(self, elem: ET.Element) -> float:
-        """Extract font size from text element."""
+    def _extract_font_size(self, attrs: Dict[str, str]) -> float:
+        """Extract font size from text element attributes."""
         try:
             # Check font-size attribute
-            font_size = elem.get('font-size')
+            font_size = attrs.get('font-size')
             if font_size:
                 return float(re.search(r'[\d.]+', font_size).group())
             
             # Check style attribute
-            style = elem.get('style', '')
+            style = attrs.get('style', '')
             font_size_match = re.search(r'font-size:\s*([\d.]+)', style)
             if font_size_match:
                 return float(font_size_match.group(1))
@@ -428,10 +395,10 @@ class SVGParser:
         
         return 12.0  # Default font size
     
-    def _is_in_target_layer(self, elem: ET.Element, target_layer: str) -> bool:
+    def _is_in_target_layer(self, attrs: Dict[str, str], target_layer: str) -> bool:
         """Check if element is in the target layer/group."""
         # Check if element or any parent has the target layer in class or id
-        current = elem
+        current = attrs
         while current is not None:
             element_class = current.get('class', '')
             element_id = current.get('id', '')
@@ -492,12 +459,23 @@ class SVGParser:
         if not boundaries:
             return None
         
-        # Calculate overall layout dimensions
-        x_coords = [b.center_x for b in boundaries]
-        y_coords = [b.center_y for b in boundaries]
+        # Calculate overall layout dimensions in a single pass
+        x_min = y_min = math.inf
+        x_max = y_max = -math.inf
+        for b in boundaries:
+            cx = b.center_x
+            cy = b.center_y
+            if cx < x_min:
+                x_min = cx
+            if cx > x_max:
+                x_max = cx
+            if cy < y_min:
+                y_min = cy
+            if cy > y_max:
+                y_max = cy
         
-        layout_width = max(x_coords) - min(x_coords)
-        layout_height = max(y_coords) - min(y_coords)
+        layout_width = x_max - x_min
+        layout_height = y_max - y_min
         layout_diameter = max(layout_width, layout_height)
         
         # Estimate wafer size based on layout diameter (assuming SVG units ~ mm)
@@ -516,8 +494,13 @@ class SVGParser:
         """Return list of supported file extensions."""
         return ['.svg']
     
-    def validate_file(self, file_path: str) -> bool:
-        """Validate if file is a valid SVG file."""
+    def validate_file(self, file_path: str, strict: bool = False) -> bool:
+        """
+        Validate if file is a valid SVG file.
+        
+        By default only the document prolog is read, up to the root element's
+        start tag. Pass strict=True to parse the whole document.
+        """
         try:
             file_path = Path(file_path)
             if not file_path.exists():
@@ -527,12 +510,172 @@ class SVGParser:
             if file_path.suffix.lower() not in self.get_supported_extensions():
                 return False
             
-            # Try to parse as XML
-            tree = ET.parse(str(file_path))
-            root = tree.getroot()
+            if strict:
+                # Parse the full document as XML
+                tree = ET.parse(str(file_path))
+                return 'svg' in tree.getroot().tag.lower()
             
-            # Check if it's an SVG file
-            return 'svg' in root.tag.lower()
+            # Feed the file until the root element's start tag is seen
+            parser = ET.XMLPullParser(events=('start',))
+            with open(file_path, 'rb') as f:
+                while True:
+                    chunk = f.read(_SNIFF_CHUNK_SIZE)
+                    if not chunk:
+                        return False
+                    parser.feed(chunk)
+                    for _, root in parser.read_events():
+                        # Check if it's an SVG file
+                        return 'svg' in root.tag.lower()
             
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+
+class _GroupCandidate:
+    """Group element whose bounding box is folded from its direct children."""
+    
+    __slots__ = ('attrs', 'child_count', 'x_min', 'y_min', 'x_max', 'y_max')
+    
+    def __init__(self, attrs: Dict[str, str]):
+        self.attrs = attrs
+        self.child_count = 0
+        self.x_min = self.y_min = math.inf
+        self.x_max = self.y_max = -math.inf
+    
+    def add_child_box(self, bbox: Tuple[Tuple[float, float], Tuple[float, float]]):
+        """Extend the group bounds with a child's bounding box."""
+        for x, y in bbox:
+            if x < self.x_min:
+                self.x_min = x
+            if x > self.x_max:
+                self.x_max = x
+            if y < self.y_min:
+                self.y_min = y
+            if y > self.y_max:
+                self.y_max = y
+    
+    def bounding_box(self) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """Return the group bounding box, or None if no child had one."""
+        if self.x_min > self.x_max:
+            return None
+        return ((self.x_min, self.y_min), (self.x_max, self.y_max))
+
+
+class _SVGScan:
+    """
+    expat callbacks that collect die candidates from an SVG document.
+    
+    No element tree is built: shape bounding boxes are read straight from
+    start-tag attributes, group bounding boxes are folded from their direct
+    children as they stream past, and character data is only buffered for
+    text-like elements up to their first child (ElementTree's ``.text``).
+    Candidates are kept per element type in document order so the parser
+    can build boundaries exactly as a tree walk would.
+    """
+    
+    def __init__(self, parser: SVGParser, target_layer: Optional[str]):
+        config = parser.die_detection_config
+        self._parser = parser
+        self._svg_ns = parser.svg_ns['svg']
+        self._target_layer = target_layer
+        
+        # Die candidates per element type
+        self.shapes: Dict[str, List[Tuple[Dict[str, str], Tuple]]] = {t: [] for t in config['target_shapes']}
+        self.texts: Dict[str, List[List[Any]]] = {t: [] for t in config['text_elements']}
+        self.groups: Dict[str, List[_GroupCandidate]] = {t: [] for t in config['group_elements']}
+        
+        # Document information for metadata
+        self.root_attrs: Dict[str, str] = {}
+        self.element_counts: Dict[str, int] = {}
+        self.document_text: Dict[str, Optional[str]] = {}
+        
+        # Open elements; each entry is the group candidate it feeds, if any
+        self._open_groups: List[Optional[_GroupCandidate]] = []
+        
+        # Pending character data and the (container, key) it is stored under
+        self._text_parts: List[str] = []
+        self._text_target: Optional[Tuple[Any, Any]] = None
+    
+    def start_element(self, name: str, attrs: Dict[str, str]):
+        # Text of the enclosing element ends at its first child
+        self._finish_text()
+        
+        namespace, _, tag = name.rpartition('|')
+        self.element_counts[tag] = self.element_counts.get(tag, 0) + 1
+        
+        if self._open_groups:
+            # Direct children contribute to the enclosing group's bounding box
+            parent = self._open_groups[-1]
+            if parent is not None:
+                parent.child_count += 1
+                bbox = self._parser._get_element_bounding_box(tag, attrs)
+                if bbox:
+                    parent.add_child_box(bbox)
+        else:
+            self.root_attrs = {_element_tree_name(key): value for key, value in attrs.items()}
+        
+        group = None
+        if namespace == self._svg_ns:
+            group = self._collect(tag, attrs)
+        self._open_groups.append(group)
+    
+    def end_element(self, name: str):
+        self._finish_text()
+        self._open_groups.pop()
+    
+    def character_data(self, data: str):
+        if self._text_target is not None:
+            self._text_parts.append(data)
+    
+    def _collect(self, tag: str, attrs: Dict[str, str]) -> Optional[_GroupCandidate]:
+        """Record an SVG element as a die candidate; return it if it is a group."""
+        if tag in ('title', 'desc'):
+            # Only the first title/description in the document is reported
+            if self._open_groups and tag not in self.document_text:
+                self.document_text[tag] = None
+                self._start_text(self.document_text, tag)
+            return None
+        
+        is_shape = tag in self.shapes
+        is_text = tag in self.texts
+        is_group = tag in self.groups
+        if not (is_shape or is_text or is_group):
+            return None
+        
+        # Filter by layer/group if specified
+        if self._target_layer and not self._parser._is_in_target_layer(attrs, self._target_layer):
+            return None
+        
+        if is_shape:
+            bbox = self._parser._get_element_bounding_box(tag, attrs)
+            if bbox is not None:
+                self.shapes[tag].append((attrs, bbox))
+            return None
+        
+        if is_text:
+            candidate = [attrs, None]
+            self.texts[tag].append(candidate)
+            self._start_text(candidate, 1)
+            return None
+        
+        group = _GroupCandidate(attrs)
+        self.groups[tag].append(group)
+        return group
+    
+    def _start_text(self, container: Any, key: Any):
+        self._text_target = (container, key)
+    
+    def _finish_text(self):
+        if self._text_target is None:
+            return
+        container, key = self._text_target
+        if self._text_parts:
+            container[key] = ''.join(self._text_parts)
+            self._text_parts = []
+        self._text_target = None
+
+
+def _element_tree_name(name: str) -> str:
+    """Convert an expat 'uri|local' name to ElementTree's '{uri}local' form."""
+    namespace, separator, local = name.rpartition('|')
+    return f'{{{namespace}}}{local}' if separator else name
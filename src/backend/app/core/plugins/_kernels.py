@@ -0,0 +1,52 @@
+"""
+Mask kernels for rule plugins over WaferMap's cached coordinate arrays.
+
+When numba is installed the kernels are JIT-compiled parallel loops that
+release the GIL; otherwise they fall back to equivalent NumPy expressions.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, nogil=True)
+    def uniform_grid_mask(xs, ys, available, spacing_x, spacing_y, start_x, start_y):
+        """Mask of available dies lying on the grid anchored at (start_x, start_y)."""
+        out = np.empty(xs.size, np.bool_)
+        for i in prange(xs.size):
+            out[i] = (available[i] and (xs[i] - start_x) % spacing_x == 0
+                      and (ys[i] - start_y) % spacing_y == 0)
+        return out
+
+    @njit(cache=True, parallel=True, nogil=True)
+    def center_mask(xs, ys, available, center_x, center_y):
+        """Mask of available dies within Chebyshev distance 1 of the center."""
+        out = np.empty(xs.size, np.bool_)
+        for i in prange(xs.size):
+            out[i] = available[i] and abs(xs[i] - center_x) <= 1 and abs(ys[i] - center_y) <= 1
+        return out
+
+    @njit(cache=True, parallel=True, nogil=True)
+    def edge_mask(xs, ys, available, low_x, high_x, low_y, high_y):
+        """Mask of available dies on or outside the given inner bounds."""
+        out = np.empty(xs.size, np.bool_)
+        for i in prange(xs.size):
+            out[i] = available[i] and (xs[i] <= low_x or xs[i] >= high_x
+                                       or ys[i] <= low_y or ys[i] >= high_y)
+        return out
+else:
+    def uniform_grid_mask(xs, ys, available, spacing_x, spacing_y, start_x, start_y):
+        """Mask of available dies lying on the grid anchored at (start_x, start_y)."""
+        return available & ((xs - start_x) % spacing_x == 0) & ((ys - start_y) % spacing_y == 0)
+
+    def center_mask(xs, ys, available, center_x, center_y):
+        """Mask of available dies within Chebyshev distance 1 of the center."""
+        return available & (np.maximum(np.abs(xs - center_x), np.abs(ys - center_y)) <= 1)
+
+    def edge_mask(xs, ys, available, low_x, high_x, low_y, high_y):
+        """Mask of available dies on or outside the given inner bounds."""
+        return available & ((xs <= low_x) | (xs >= high_x) | (ys <= low_y) | (ys >= high_y))
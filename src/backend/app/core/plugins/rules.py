@@ -1,14 +1,20 @@
 """
 Rule Plugin System - Pluggable sampling rules.
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence, Set, Tuple
 from abc import abstractmethod
 import logging
+import random
+import threading
 
+import numpy as np
+
+from ._kernels import center_mask, edge_mask, uniform_grid_mask
 from .registry import Plugin, PluginMetadata, register_plugin
 from ..strategy.compilation import ExecutableRule, ExecutionContext
 from ..models.die import Die
-from ..models.wafer_map import WaferMap
+from ..models.wafer_map import PACKABLE_MAX, PACKABLE_MIN, WaferMap, pack_coordinates
+from ..models._rule_kernels import fixed_point_mask
 
 logger = logging.getLogger(__name__)
 
@@ -31,14 +37,23 @@ class RulePlugin(Plugin, ExecutableRule):
         self._initialized = False
     
     @abstractmethod
-    def apply(self, wafer_map: WaferMap, context: ExecutionContext) -> List[Die]:
+    def apply(self, wafer_map: WaferMap, context: ExecutionContext,
+              already_selected: Optional[Set[Tuple[int, int]]] = None) -> List[Die]:
         """Apply rule to wafer map with context."""
         pass
     
+    @staticmethod
+    def _take(dies: List[Die], indices: Sequence[int],
+              already_selected: Optional[Set[Tuple[int, int]]] = None) -> List[Die]:
+        """Gather dies at indices, skipping coordinates another rule already selected."""
+        if not already_selected:
+            return [dies[i] for i in indices]
+        return [die for die in map(dies.__getitem__, indices) if (die.x, die.y) not in already_selected]
+    
     def estimate_performance(self, wafer_map: WaferMap) -> Dict[str, Any]:
         """Estimate execution performance."""
         return {
-            "estimated_time_ms": len(wafer_map.dies) * 0.1,
+            "estimated_time_ms": wafer_map.die_count * 0.1,
             "memory_usage": "low",
             "complexity": "O(n)"
         }
@@ -59,21 +74,35 @@ class FixedPointRulePlugin(RulePlugin):
             dependencies=[]
         )
     
-    def apply(self, wafer_map: WaferMap, context: ExecutionContext) -> List[Die]:
+    def initialize(self, config: Dict[str, Any]) -> bool:
+        """Initialize rule and pack the configured points into int64 keys."""
+        # Non-integral or unpackable points can never match a die, so drop them up front
+        points = {
+            (int(x), int(y)) for x, y in config.get("points", [])
+            if x == int(x) and y == int(y)
+            and PACKABLE_MIN <= x <= PACKABLE_MAX and PACKABLE_MIN <= y <= PACKABLE_MAX
+        }
+        xs = np.fromiter((x for x, _ in points), dtype=np.int64, count=len(points))
+        ys = np.fromiter((y for _, y in points), dtype=np.int64, count=len(points))
+        self._packed_points = np.unique(pack_coordinates(xs, ys))
+        return super().initialize(config)
+    
+    def apply(self, wafer_map: WaferMap, context: ExecutionContext,
+              already_selected: Optional[Set[Tuple[int, int]]] = None) -> List[Die]:
         """Apply fixed point rule."""
         if not self._initialized:
             logger.error("Rule not initialized")
             return []
         
-        points = self._config.get("points", [])
-        if not points:
+        if not self._config.get("points"):
             logger.warning("No points specified for FixedPointRule")
             return []
         
-        selected = []
-        for die in wafer_map.dies:
-            if (die.x, die.y) in points and die.available:
-                selected.append(die)
+        # Membership test of packed die coordinates against the sorted point keys
+        mask = fixed_point_mask(wafer_map.packed_coords, self._packed_points)
+        mask &= wafer_map.available_mask
+        dies = wafer_map.dies
+        selected = self._take(dies, np.flatnonzero(mask), already_selected)
         
         logger.debug(f"FixedPointRule selected {len(selected)} dies")
         return selected
@@ -94,7 +123,8 @@ class CenterEdgeRulePlugin(RulePlugin):
             dependencies=[]
         )
     
-    def apply(self, wafer_map: WaferMap, context: ExecutionContext) -> List[Die]:
+    def apply(self, wafer_map: WaferMap, context: ExecutionContext,
+              already_selected: Optional[Set[Tuple[int, int]]] = None) -> List[Die]:
         """Apply center-edge rule."""
         if not self._initialized:
             return []
@@ -103,37 +133,31 @@ class CenterEdgeRulePlugin(RulePlugin):
         edge_count = self._config.get("edge_count", 4)
         edge_margin = self._config.get("edge_margin", 1)
         
-        if not wafer_map.dies:
+        dies = wafer_map.dies
+        if not dies:
             return []
         
-        # Calculate wafer bounds
-        x_coords = [die.x for die in wafer_map.dies]
-        y_coords = [die.y for die in wafer_map.dies]
-        min_x, max_x = min(x_coords), max(x_coords)
-        min_y, max_y = min(y_coords), max(y_coords)
-        
-        selected = []
+        # Calculate wafer bounds from the cached coordinate arrays
+        xs, ys = wafer_map.xs, wafer_map.ys
+        min_x, max_x = int(xs.min()), int(xs.max())
+        min_y, max_y = int(ys.min()), int(ys.max())
+        available = wafer_map.available_mask
         
-        # Select center dies
+        # Select center dies: Chebyshev distance <= 1 from the wafer center
         center_x = (min_x + max_x) // 2
         center_y = (min_y + max_y) // 2
         
-        center_candidates = [
-            die for die in wafer_map.dies 
-            if abs(die.x - center_x) <= 1 and abs(die.y - center_y) <= 1 and die.available
-        ]
-        selected.extend(center_candidates[:center_count])
+        center_idx = np.flatnonzero(center_mask(xs, ys, available, center_x, center_y))[:center_count]
         
-        # Select edge dies
-        edge_candidates = [
-            die for die in wafer_map.dies
-            if (die.x <= min_x + edge_margin or die.x >= max_x - edge_margin or
-                die.y <= min_y + edge_margin or die.y >= max_y - edge_margin) and die.available
-        ]
+        # Select edge dies, skipping any already selected as center
+        edges = edge_mask(xs, ys, available,
+                          min_x + edge_margin, max_x - edge_margin,
+                          min_y + edge_margin, max_y - edge_margin)
+        edges[center_idx] = False
+        edge_idx = np.flatnonzero(edges)[:edge_count]
         
-        # Remove any that were already selected as center
-        edge_candidates = [die for die in edge_candidates if die not in selected]
-        selected.extend(edge_candidates[:edge_count])
+        selected = [dies[i] for i in center_idx]
+        selected.extend(dies[i] for i in edge_idx)
         
         logger.debug(f"CenterEdgeRule selected {len(selected)} dies")
         return selected
@@ -154,7 +178,8 @@ class UniformGridRulePlugin(RulePlugin):
             dependencies=[]
         )
     
-    def apply(self, wafer_map: WaferMap, context: ExecutionContext) -> List[Die]:
+    def apply(self, wafer_map: WaferMap, context: ExecutionContext,
+              already_selected: Optional[Set[Tuple[int, int]]] = None) -> List[Die]:
         """Apply uniform grid rule."""
         if not self._initialized:
             return []
@@ -164,23 +189,24 @@ class UniformGridRulePlugin(RulePlugin):
         offset_x = self._config.get("offset_x", 0)
         offset_y = self._config.get("offset_y", 0)
         
-        if not wafer_map.dies:
+        dies = wafer_map.dies
+        if not dies:
             return []
         
-        # Calculate starting position
-        x_coords = [die.x for die in wafer_map.dies]
-        y_coords = [die.y for die in wafer_map.dies]
-        min_x, min_y = min(x_coords), min(y_coords)
+        if not spacing_x or not spacing_y:
+            logger.warning("UniformGridRule spacing must be non-zero")
+            return []
+        
+        # Grid test runs as a mask kernel over the cached coordinate arrays
+        xs, ys = wafer_map.xs, wafer_map.ys
+        available = wafer_map.available_mask
         
-        start_x = min_x + offset_x
-        start_y = min_y + offset_y
+        # Calculate starting position
+        start_x = int(xs.min()) + offset_x
+        start_y = int(ys.min()) + offset_y
         
-        selected = []
-        for die in wafer_map.dies:
-            if (die.available and 
-                (die.x - start_x) % spacing_x == 0 and 
-                (die.y - start_y) % spacing_y == 0):
-                selected.append(die)
+        mask = uniform_grid_mask(xs, ys, available, spacing_x, spacing_y, start_x, start_y)
+        selected = self._take(dies, np.flatnonzero(mask), already_selected)
         
         logger.debug(f"UniformGridRule selected {len(selected)} dies")
         return selected
@@ -201,25 +227,36 @@ class RandomSamplingRulePlugin(RulePlugin):
             dependencies=[]
         )
     
-    def apply(self, wafer_map: WaferMap, context: ExecutionContext) -> List[Die]:
+    def initialize(self, config: Dict[str, Any]) -> bool:
+        """Initialize rule with a private RNG so sampling never touches global state."""
+        self._seed = config.get("seed")
+        self._rng = random.Random(self._seed)
+        # Cached rule instances run in several worker threads; draws from the shared RNG are serialized
+        self._rng_lock = threading.Lock()
+        return super().initialize(config)
+    
+    def apply(self, wafer_map: WaferMap, context: ExecutionContext,
+              already_selected: Optional[Set[Tuple[int, int]]] = None) -> List[Die]:
         """Apply random sampling rule."""
         if not self._initialized:
             return []
         
-        import random
-        
         sample_count = self._config.get("sample_count", 10)
-        seed = self._config.get("seed")
-        
-        if seed is not None:
-            random.seed(seed)
         
-        available_dies = [die for die in wafer_map.dies if die.available]
+        dies = wafer_map.dies
+        available_idx = np.flatnonzero(wafer_map.available_mask)
         
-        if len(available_dies) <= sample_count:
-            selected = available_dies
+        if len(available_idx) <= sample_count:
+            selected = [dies[i] for i in available_idx]
         else:
-            selected = random.sample(available_dies, sample_count)
+            # A seeded rule gets a fresh generator per call so it stays reproducible
+            # even when the shared rule instance runs in several threads at once
+            if self._seed is not None:
+                picks = random.Random(self._seed).sample(range(len(available_idx)), sample_count)
+            else:
+                with self._rng_lock:
+                    picks = self._rng.sample(range(len(available_idx)), sample_count)
+            selected = [dies[available_idx[i]] for i in picks]
         
         logger.debug(f"RandomSamplingRule selected {len(selected)} dies")
         return selected
@@ -1,11 +1,19 @@
 """
 Strategy Compilation Layer - Converts definitions into validated, executable forms.
 """
-from typing import Dict, List, Optional, Any, Protocol
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Protocol, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
+from datetime import datetime
+import copy
+import hashlib
+import inspect
+import json
+import threading
+import uuid
 
-from .definition import StrategyDefinition, RuleConfig
+from .definition import StrategyDefinition, RuleConfig, freeze
 from ..models.wafer_map import WaferMap
 from ..models.die import Die
 
@@ -14,8 +22,12 @@ class ExecutableRule(ABC):
     """Interface for compiled, executable rules."""
     
     @abstractmethod
-    def apply(self, wafer_map: WaferMap, context: 'ExecutionContext') -> List[Die]:
-        """Apply rule to wafer map with given context."""
+    def apply(self, wafer_map: WaferMap, context: 'ExecutionContext',
+              already_selected: Optional[Set[Tuple[int, int]]] = None) -> List[Die]:
+        """
+        Apply rule to wafer map with given context, optionally skipping already selected coordinates.
+        Rules whose apply takes only (wafer_map, context) are still supported and get no already_selected.
+        """
         pass
     
     @abstractmethod
@@ -24,14 +36,15 @@ class ExecutableRule(ABC):
         pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExecutionContext:
     """Runtime context for strategy execution."""
     wafer_map: WaferMap
     process_parameters: Dict[str, Any]
     tool_constraints: Dict[str, Any]
-    execution_id: str
-    timestamp: str
+    # Stamped on first read via get_execution_id/get_timestamp unless given up front
+    execution_id: Optional[str] = None
+    timestamp: Optional[str] = None
     
     # Environment context
     wafer_size: Optional[str] = None
@@ -39,19 +52,36 @@ class ExecutionContext:
     process_layer: Optional[str] = None
     defect_density: Optional[float] = None
     
+    # Merged context dictionary, built once per execution and shared by all rules
+    _context_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def get_execution_id(self) -> str:
+        """Get the execution ID, generating one on first use."""
+        if self.execution_id is None:
+            object.__setattr__(self, "execution_id", str(uuid.uuid4()))
+        return self.execution_id
+    
+    def get_timestamp(self) -> str:
+        """Get the execution timestamp, stamping the current time on first use."""
+        if self.timestamp is None:
+            object.__setattr__(self, "timestamp", datetime.now().isoformat())
+        return self.timestamp
+    
     def get_context_dict(self) -> Dict[str, Any]:
         """Get context as dictionary for condition evaluation."""
-        return {
-            "wafer_size": self.wafer_size,
-            "product_type": self.product_type,
-            "process_layer": self.process_layer,
-            "defect_density": self.defect_density,
-            **self.process_parameters,
-            **self.tool_constraints
-        }
+        if self._context_dict is None:
+            object.__setattr__(self, "_context_dict", {
+                "wafer_size": self.wafer_size,
+                "product_type": self.product_type,
+                "process_layer": self.process_layer,
+                "defect_density": self.defect_density,
+                **self.process_parameters,
+                **self.tool_constraints
+            })
+        return self._context_dict
 
 
-@dataclass 
+@dataclass(slots=True)
 class CompiledStrategy:
     """
     Resolved, validated, executable form of a strategy.
@@ -64,25 +94,26 @@ class CompiledStrategy:
     validation_results: Dict[str, Any]
     performance_estimate: Dict[str, Any]
     
+    # Generated straight-line runner, rebuilt if compiled_rules is replaced or resized
+    _runner: Optional[Callable[[ExecutionContext], List[Die]]] = field(default=None, repr=False, compare=False)
+    _runner_key: Optional[Tuple[int, int]] = field(default=None, repr=False, compare=False)
+    
     def execute(self, context: ExecutionContext) -> List[Die]:
-        """Execute strategy against execution context."""
-        selected_dies = []
-        
-        # Apply each compiled rule
-        for rule in self.compiled_rules:
-            rule_result = rule.apply(context.wafer_map, context)
-            selected_dies.extend(rule_result)
-        
-        # Remove duplicates while preserving order
-        unique_dies = []
-        seen_coordinates = set()
-        for die in selected_dies:
-            coord = (die.x, die.y)
-            if coord not in seen_coordinates:
-                unique_dies.append(die)
-                seen_coordinates.add(coord)
-        
-        return unique_dies
+        """Execute strategy against execution context; rule failures raise ExecutionError."""
+        try:
+            return self.get_runner()(context)
+        except ExecutionError:
+            raise
+        except Exception as e:
+            raise ExecutionError(f"Strategy execution failed: {e}") from e
+    
+    def get_runner(self) -> Callable[[ExecutionContext], List[Die]]:
+        """Return the generated function applying this strategy's rules in order."""
+        key = (id(self.compiled_rules), len(self.compiled_rules))
+        if self._runner is None or self._runner_key != key:
+            self._runner = _generate_runner(self.compiled_rules, self.definition_id)
+            self._runner_key = key
+        return self._runner
     
     def validate_execution_context(self, context: ExecutionContext) -> List[str]:
         """Validate that context meets strategy requirements."""
@@ -100,27 +131,42 @@ class StrategyCompiler:
     Handles dependency resolution, validation, and optimization.
     """
     
-    def __init__(self, rule_factory):
+    def __init__(self, rule_factory, cache_size: int = 128):
         self.rule_factory = rule_factory
-        self._compilation_cache: Dict[str, CompiledStrategy] = {}
+        self.cache_size = cache_size
+        self._compilation_cache: "OrderedDict[Tuple[str, str, str], CompiledStrategy]" = OrderedDict()
+        # Compiles run from worker threads; the lock keeps LRU bookkeeping consistent
+        self._cache_lock = threading.Lock()
     
     def compile(self, definition: StrategyDefinition) -> CompiledStrategy:
         """Compile strategy definition into executable form."""
-        # Check cache first
-        cache_key = f"{definition.id}:{definition.version}"
-        if cache_key in self._compilation_cache:
-            return self._compilation_cache[cache_key]
+        # Check cache first; the content hash makes in-place edits recompile
+        content_hash = hashlib.blake2b(
+            json.dumps(definition.to_dict(), sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).hexdigest()
+        cache_key = (definition.id, definition.version, content_hash)
+        with self._cache_lock:
+            cached = self._compilation_cache.get(cache_key)
+            if cached is not None:
+                self._compilation_cache.move_to_end(cache_key)
+                return cached
         
         # Validate definition
         validation_errors = definition.validate()
         if validation_errors:
             raise CompilationError(f"Strategy validation failed: {validation_errors}")
         
-        # Compile rules
+        # Compile rules; factory failures surface as CompilationError
         compiled_rules = []
         for rule_config in definition.rules:
             if rule_config.enabled:
-                executable_rule = self.rule_factory.create_rule(rule_config)
+                try:
+                    executable_rule = self.rule_factory.create_rule(rule_config)
+                except CompilationError:
+                    raise
+                except Exception as e:
+                    raise CompilationError(f"Failed to compile rule {rule_config.rule_type}: {e}") from e
                 compiled_rules.append(executable_rule)
         
         # Create compiled strategy
@@ -136,9 +182,13 @@ class StrategyCompiler:
             validation_results={"errors": [], "warnings": []},
             performance_estimate=self._estimate_performance(compiled_rules)
         )
+        compiled.get_runner()
         
-        # Cache compiled strategy
-        self._compilation_cache[cache_key] = compiled
+        # Cache compiled strategy, evicting the least recently used entry
+        with self._cache_lock:
+            self._compilation_cache[cache_key] = compiled
+            if len(self._compilation_cache) > self.cache_size:
+                self._compilation_cache.popitem(last=False)
         
         return compiled
     
@@ -150,29 +200,104 @@ class StrategyCompiler:
             "complexity_score": len(rules)
         }
 
+def _generate_runner(rules: List[ExecutableRule], strategy_id: str) -> Callable[[ExecutionContext], List[Die]]:
+    """
+    Emit and compile a function that applies each rule in turn without a per-rule dispatch loop.
+    Rules share the running selection so they can skip coordinates already taken.
+    """
+    lines = [
+        "def _run(context):",
+        "    wafer_map = context.wafer_map",
+        "    unique_dies = []",
+        "    seen_coordinates = set()",
+        "    append = unique_dies.append",
+        "    add = seen_coordinates.add",
+    ]
+    namespace: Dict[str, Any] = {}
+    for i, rule in enumerate(rules):
+        namespace[f"apply{i}"] = rule.apply
+        call = (f"apply{i}(wafer_map, context, already_selected=seen_coordinates)"
+                if _accepts_already_selected(rule.apply) else f"apply{i}(wafer_map, context)")
+        lines += [
+            f"    for die in {call}:",
+            "        coord = (die.x, die.y)",
+            "        if coord not in seen_coordinates:",
+            "            add(coord)",
+            "            append(die)",
+        ]
+    lines.append("    return unique_dies")
+    
+    exec(compile("\n".join(lines), f"<strategy:{strategy_id}>", "exec"), namespace)
+    return namespace["_run"]
+
+
+def _accepts_already_selected(apply: Callable[..., List[Die]]) -> bool:
+    """Whether a rule's apply takes already_selected; rules registered before it existed take two arguments."""
+    try:
+        parameters = inspect.signature(apply).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(parameter.name == "already_selected" or parameter.kind is inspect.Parameter.VAR_KEYWORD
+               for parameter in parameters)
+
 
 class CompilationError(Exception):
     """Raised when strategy compilation fails."""
     pass
 
 
+class ExecutionError(Exception):
+    """Raised when a compiled strategy fails while executing."""
+    pass
+
+
 class RuleFactory:
     """Factory for creating executable rules from rule configurations."""
     
-    def __init__(self, plugin_factory=None):
+    def __init__(self, plugin_factory=None, cache_size: int = 256):
         self.plugin_factory = plugin_factory
+        self.cache_size = cache_size
         self._rule_registry: Dict[str, type] = {}
+        self._rule_cache: "OrderedDict[Any, ExecutableRule]" = OrderedDict()
+        # Rules are created from worker threads; the lock keeps LRU bookkeeping consistent
+        self._cache_lock = threading.Lock()
     
     def register_rule_type(self, rule_type: str, rule_class: type):
         """Register a rule implementation."""
         self._rule_registry[rule_type] = rule_class
+        with self._cache_lock:
+            self._rule_cache.clear()
     
     def create_rule(self, rule_config: RuleConfig) -> ExecutableRule:
-        """Create executable rule from configuration."""
+        """Create executable rule from configuration, reusing instances for identical configs."""
+        try:
+            cache_key = (rule_config.rule_type, freeze(rule_config.parameters))
+            with self._cache_lock:
+                cached = self._rule_cache.get(cache_key)
+                if cached is not None:
+                    self._rule_cache.move_to_end(cache_key)
+                    return cached
+        except TypeError:
+            # Unhashable parameter values; build a fresh rule without caching
+            return self._build_rule(rule_config)
+        
+        rule = self._build_rule(rule_config)
+        # Cache the rule, evicting the least recently used entry
+        with self._cache_lock:
+            self._rule_cache[cache_key] = rule
+            if len(self._rule_cache) > self.cache_size:
+                self._rule_cache.popitem(last=False)
+        return rule
+    
+    def _build_rule(self, rule_config: RuleConfig) -> ExecutableRule:
+        """Instantiate an executable rule from configuration."""
+        # Cached rules outlive the config, so give them a private copy of its parameters
+        parameters = copy.deepcopy(rule_config.parameters)
+        
         # First try plugin system if available
         if self.plugin_factory:
             try:
-                return self.plugin_factory.create_rule(rule_config.rule_type, rule_config.parameters)
+                return self.plugin_factory.create_rule(rule_config.rule_type, parameters)
             except Exception:
                 pass  # Fall back to legacy registry
         
@@ -181,7 +306,7 @@ class RuleFactory:
         if not rule_class:
             raise CompilationError(f"Unknown rule type: {rule_config.rule_type}")
         
-        return rule_class(rule_config.parameters)
+        return rule_class(parameters)
     
     def get_available_rule_types(self) -> List[str]:
         """Get list of available rule types."""
@@ -1,13 +1,69 @@
 """
 Strategy Definition Layer - User-created templates that are serializable and versionable.
 """
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Any
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
+from weakref import WeakValueDictionary
 import uuid
 
 
+def freeze(value: Any) -> Any:
+    """Recursively convert rule parameters into a hashable key."""
+    if isinstance(value, dict):
+        return tuple(sorted(((key, freeze(item)) for key, item in value.items()), key=str))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    # Tag scalars with their type so 1, 1.0 and True stay distinct keys
+    return type(value), value
+
+
+class FrozenDict(dict):
+    """Read-only dict whose nested lists, sets and dicts are frozen on construction."""
+    __slots__ = ()
+    
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, ((key, _frozen(item)) for key, item in dict(*args, **kwargs).items()))
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only")
+    
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+    
+    def __hash__(self) -> int:
+        return hash(freeze(self))
+    
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+    
+    def __copy__(self) -> 'FrozenDict':
+        return self
+    
+    def __deepcopy__(self, memo) -> 'FrozenDict':
+        return self
+
+
+def _frozen(value: Any) -> Any:
+    """Immutable equivalent of a parameter value: dicts become FrozenDict, lists tuples, sets frozensets."""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_frozen(item) for item in value)
+    return value
+
+
+def _is_blank(value: str) -> bool:
+    """True for empty or whitespace-only strings, without allocating a stripped copy."""
+    return not value or value.isspace()
+
+
 class StrategyType(Enum):
     """Supported strategy types."""
     FIXED_POINT = "fixed_point"
@@ -27,7 +83,7 @@ class StrategyLifecycle(Enum):
     DEPRECATED = "deprecated"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConditionalLogic:
     """Defines conditions that affect strategy execution."""
     wafer_size: Optional[str] = None  # e.g., "300mm", "200mm"
@@ -42,7 +98,7 @@ class ConditionalLogic:
         return True
 
 
-@dataclass
+@dataclass(slots=True)
 class TransformationConfig:
     """Coordinate transformation parameters."""
     rotation_angle: float = 0.0
@@ -54,14 +110,44 @@ class TransformationConfig:
     custom_transforms: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class RuleConfig:
     """Configuration for a specific rule within a strategy."""
     rule_type: str
-    parameters: Dict[str, Any]
+    parameters: Mapping[str, Any]
     weight: float = 1.0
     conditions: Optional[ConditionalLogic] = None
     enabled: bool = True
+    
+    def __post_init__(self):
+        # Configs are shared between strategies, so their parameters must not change either
+        if not isinstance(self.parameters, FrozenDict):
+            object.__setattr__(self, "parameters", FrozenDict(self.parameters))
+    
+    def __hash__(self) -> int:
+        return hash((self.rule_type, self.parameters, self.weight, self.enabled))
+    
+    @classmethod
+    def get_or_create(cls, rule_type: str, parameters: Dict[str, Any], weight: float = 1.0,
+                      conditions: Optional[ConditionalLogic] = None, enabled: bool = True) -> 'RuleConfig':
+        """Return the shared instance for an identical unconditional rule config, creating it if needed."""
+        if conditions is not None:
+            return cls(rule_type, parameters, weight, conditions, enabled)
+        try:
+            key = (rule_type, freeze(parameters), freeze(weight), enabled)
+            config = _rule_config_pool.get(key)
+        except TypeError:
+            # Unhashable parameter values; keep a private config
+            return cls(rule_type, parameters, weight, conditions, enabled)
+        
+        if config is None:
+            # The config freezes its own copy of parameters, so later edits to the input cannot leak in
+            config = _rule_config_pool.setdefault(key, cls(rule_type, parameters, weight, None, enabled))
+        return config
+
+
+# Identical rule configs shared across strategies; entries vanish once no strategy holds them
+_rule_config_pool: "WeakValueDictionary[Any, RuleConfig]" = WeakValueDictionary()
 
 
 @dataclass
@@ -101,34 +187,12 @@ class StrategyDefinition:
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dictionary for storage/transmission."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "strategy_type": self.strategy_type.value,
-            "process_step": self.process_step,
-            "tool_type": self.tool_type,
-            "rules": [
-                {
-                    "rule_type": rule.rule_type,
-                    "parameters": rule.parameters,
-                    "weight": rule.weight,
-                    "enabled": rule.enabled,
-                    "conditions": rule.conditions.__dict__ if rule.conditions else None
-                }
-                for rule in self.rules
-            ],
-            "conditions": self.conditions.__dict__ if self.conditions else None,
-            "transformations": self.transformations.__dict__ if self.transformations else None,
-            "target_vendor": self.target_vendor,
-            "vendor_specific_params": self.vendor_specific_params,
-            "version": self.version,
-            "author": self.author,
-            "created_at": self.created_at.isoformat(),
-            "modified_at": self.modified_at.isoformat(),
-            "lifecycle_state": self.lifecycle_state.value,
-            "schema_version": self.schema_version
-        }
+        data = asdict(self)
+        data["strategy_type"] = self.strategy_type.value
+        data["created_at"] = self.created_at.isoformat()
+        data["modified_at"] = self.modified_at.isoformat()
+        data["lifecycle_state"] = self.lifecycle_state.value
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'StrategyDefinition':
@@ -142,7 +206,7 @@ class StrategyDefinition:
             if rule_data.get('conditions'):
                 conditions = ConditionalLogic(**rule_data['conditions'])
             
-            rule = RuleConfig(
+            rule = RuleConfig.get_or_create(
                 rule_type=rule_data['rule_type'],
                 parameters=rule_data.get('parameters', {}),
                 weight=rule_data.get('weight', 1.0),
@@ -185,13 +249,13 @@ class StrategyDefinition:
         """Validate strategy definition and return list of errors."""
         errors = []
         
-        if not self.name.strip():
+        if _is_blank(self.name):
             errors.append("Strategy name is required")
         
-        if not self.process_step.strip():
+        if _is_blank(self.process_step):
             errors.append("Process step is required")
             
-        if not self.tool_type.strip():
+        if _is_blank(self.tool_type):
             errors.append("Tool type is required")
             
         # Only require rules if explicitly requested (for execution vs creation)
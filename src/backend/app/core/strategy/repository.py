@@ -1,16 +1,19 @@
 """
 Strategy Repository - Handles persistence, versioning, and lifecycle management.
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 import json
+import mmap
+import os
 
 from .definition import StrategyDefinition, StrategyLifecycle
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyVersion:
     """Represents a specific version of a strategy."""
     strategy_id: str
@@ -30,6 +33,10 @@ class StrategyRepository(ABC):
         """Save a strategy definition and return version info."""
         pass
     
+    def save_many(self, definitions: List[StrategyDefinition]) -> List[StrategyVersion]:
+        """Save several strategy definitions; backends override this to batch the writes."""
+        return [self.save(definition) for definition in definitions]
+    
     @abstractmethod
     def get_by_id(self, strategy_id: str, version: Optional[str] = None) -> Optional[StrategyDefinition]:
         """Get strategy by ID, optionally specific version."""
@@ -59,6 +66,15 @@ class StrategyRepository(ABC):
         pass
 
 
+def _version_key(version: str) -> Tuple[Tuple[int, str], ...]:
+    """Sort key comparing dotted versions numerically (so 1.10.0 > 1.9.0)."""
+    return tuple((int(part), "") if part.isdigit() else (-1, part) for part in version.split("."))
+
+
+# (process_step, tool_type, lifecycle_state) with None standing for "any"
+_FilterKey = Tuple[Optional[str], Optional[str], Optional[StrategyLifecycle]]
+
+
 class InMemoryStrategyRepository(StrategyRepository):
     """In-memory implementation for development and testing."""
     
@@ -66,6 +82,32 @@ class InMemoryStrategyRepository(StrategyRepository):
         self._strategies: Dict[str, Dict[str, StrategyDefinition]] = {}
         self._versions: Dict[str, List[StrategyVersion]] = {}
         self._active_versions: Dict[str, str] = {}
+        self._latest_versions: Dict[str, str] = {}
+        
+        # Secondary index over each strategy's current definition, keyed by every
+        # (process_step, tool_type, lifecycle_state) filter combination with None as a wildcard
+        self._by_filter: Dict[_FilterKey, Set[str]] = defaultdict(set)
+        self._index_keys: Dict[str, Tuple[_FilterKey, ...]] = {}
+        self._order: Dict[str, int] = {}
+    
+    def _reindex(self, strategy_id: str) -> None:
+        """Move a strategy to the index buckets of its current definition."""
+        for key in self._index_keys.pop(strategy_id, ()):
+            self._by_filter[key].discard(strategy_id)
+        
+        definition = self.get_by_id(strategy_id)
+        if definition is None:
+            return
+        
+        keys = tuple(
+            (process_step, tool_type, state)
+            for process_step in (definition.process_step, None)
+            for tool_type in (definition.tool_type, None)
+            for state in (definition.lifecycle_state, None)
+        )
+        for key in keys:
+            self._by_filter[key].add(strategy_id)
+        self._index_keys[strategy_id] = keys
     
     def save(self, definition: StrategyDefinition) -> StrategyVersion:
         """Save strategy definition."""
@@ -75,9 +117,13 @@ class InMemoryStrategyRepository(StrategyRepository):
         if strategy_id not in self._strategies:
             self._strategies[strategy_id] = {}
             self._versions[strategy_id] = []
+            self._order[strategy_id] = len(self._order)
         
-        # Store definition
+        # Store definition and track the latest version incrementally
         self._strategies[strategy_id][definition.version] = definition
+        latest = self._latest_versions.get(strategy_id)
+        if latest is None or _version_key(definition.version) > _version_key(latest):
+            self._latest_versions[strategy_id] = definition.version
         
         # Create version record
         version = StrategyVersion(
@@ -95,6 +141,7 @@ class InMemoryStrategyRepository(StrategyRepository):
         if definition.lifecycle_state == StrategyLifecycle.ACTIVE:
             self._active_versions[strategy_id] = definition.version
         
+        self._reindex(strategy_id)
         return version
     
     def get_by_id(self, strategy_id: str, version: Optional[str] = None) -> Optional[StrategyDefinition]:
@@ -104,10 +151,7 @@ class InMemoryStrategyRepository(StrategyRepository):
         
         if version is None:
             # Get active version or latest
-            version = self._active_versions.get(strategy_id)
-            if version is None:
-                versions = sorted(self._strategies[strategy_id].keys(), reverse=True)
-                version = versions[0] if versions else None
+            version = self._active_versions.get(strategy_id) or self._latest_versions.get(strategy_id)
         
         return self._strategies[strategy_id].get(version) if version else None
     
@@ -116,23 +160,15 @@ class InMemoryStrategyRepository(StrategyRepository):
                        tool_type: Optional[str] = None,
                        lifecycle_state: Optional[StrategyLifecycle] = None) -> List[StrategyDefinition]:
         """List strategies with filters."""
-        results = []
+        # One bucket lookup covers any combination of filters; falsy filters are wildcards
+        candidates = self._by_filter.get((process_step or None, tool_type or None, lifecycle_state or None), ())
         
-        for strategy_id in self._strategies:
-            # Get latest version of each strategy
+        # Materialize only the matches, in insertion order
+        results = []
+        for strategy_id in sorted(candidates, key=self._order.__getitem__):
             definition = self.get_by_id(strategy_id)
-            if definition is None:
-                continue
-            
-            # Apply filters
-            if process_step and definition.process_step != process_step:
-                continue
-            if tool_type and definition.tool_type != tool_type:
-                continue
-            if lifecycle_state and definition.lifecycle_state != lifecycle_state:
-                continue
-            
-            results.append(definition)
+            if definition is not None:
+                results.append(definition)
         
         return results
     
@@ -155,6 +191,7 @@ class InMemoryStrategyRepository(StrategyRepository):
         elif strategy_id in self._active_versions and self._active_versions[strategy_id] == definition.version:
             del self._active_versions[strategy_id]
         
+        self._reindex(strategy_id)
         return True
     
     def delete(self, strategy_id: str) -> bool:
@@ -164,22 +201,263 @@ class InMemoryStrategyRepository(StrategyRepository):
             return False
         
         definition.lifecycle_state = StrategyLifecycle.DEPRECATED
+        self._reindex(strategy_id)
         return True
 
 
 class FileSystemStrategyRepository(StrategyRepository):
-    """File system-based repository implementation."""
+    """
+    File system-based repository implementation.
+    
+    Each strategy is an append-only JSONL log ({strategy_id}.jsonl) holding one
+    version record per line. A small index.json maps every strategy to the byte
+    offset of each version's latest record, so reads mmap the log and seek
+    straight to a single line instead of parsing older versions. The index also
+    records each log's length; logs it does not cover are rescanned on open.
+    """
+    
+    INDEX_FILE = "index.json"
     
     def __init__(self, storage_path: str):
         self.storage_path = storage_path
-        # Implementation would handle file-based persistence
+        os.makedirs(storage_path, exist_ok=True)
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+        if self._reconcile_index():
+            self._write_index()
+    
+    def _log_path(self, strategy_id: str) -> str:
+        """Path of the append-only log for a strategy."""
+        self._check_id(strategy_id)
+        return os.path.join(self.storage_path, f"{strategy_id}.jsonl")
+    
+    @staticmethod
+    def _is_valid_id(strategy_id: str) -> bool:
+        """Whether an id is a plain file name, so its log stays inside the storage directory."""
+        return (isinstance(strategy_id, str) and strategy_id not in ("", ".", "..")
+                and os.path.basename(strategy_id) == strategy_id)
+    
+    @classmethod
+    def _check_id(cls, strategy_id: str) -> None:
+        """Reject ids that would place a log outside the storage directory."""
+        if not cls._is_valid_id(strategy_id):
+            raise ValueError(f"Invalid strategy id for file storage: {strategy_id!r}")
+    
+    @staticmethod
+    def _parse_record(line: bytes) -> Optional[Dict[str, Any]]:
+        """Parse one log line; anything that is not a JSON object with a string version is invalid."""
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict) or not isinstance(record.get("version"), str):
+            return None
+        return record
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the offset index from disk; a missing or unreadable index loads as empty."""
+        index_path = os.path.join(self.storage_path, self.INDEX_FILE)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+    
+    def _reconcile_index(self) -> bool:
+        """Rescan logs whose length the index does not match and drop entries without a log."""
+        # A crash between appending a record and rewriting the index leaves the index behind its logs
+        logs = {name[:-len(".jsonl")] for name in os.listdir(self.storage_path) if name.endswith(".jsonl")}
+        logs = {strategy_id for strategy_id in logs if self._is_valid_id(strategy_id)}
+        changed = False
+        for strategy_id in set(self._index) - logs:
+            del self._index[strategy_id]
+            changed = True
+        for strategy_id in logs:
+            entry = self._index.get(strategy_id)
+            if entry is None or entry.get("size") != os.path.getsize(self._log_path(strategy_id)):
+                self._index[strategy_id] = self._scan_log(strategy_id)
+                changed = True
+        return changed
+    
+    def _scan_log(self, strategy_id: str) -> Dict[str, Any]:
+        """Rebuild a strategy's index entry from its log, cutting off a torn final line."""
+        entry = {"versions": {}, "latest": None, "active": None, "size": 0}
+        path = self._log_path(strategy_id)
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                record = self._parse_record(line)
+                if record is not None:
+                    self._index_version(entry, record["version"], record.get("is_active", False), offset)
+                offset += len(line)
+        
+        # Appends must start on a fresh line, so drop a partially written record
+        if offset != os.path.getsize(path):
+            os.truncate(path, offset)
+        entry["size"] = offset
+        return entry
+    
+    @staticmethod
+    def _index_version(entry: Dict[str, Any], version: str, is_active: bool, offset: int) -> None:
+        """Point an index entry at the record for a version written at offset."""
+        entry["versions"][version] = offset
+        latest = entry["latest"]
+        if latest is None or _version_key(version) > _version_key(latest):
+            entry["latest"] = version
+        if is_active:
+            entry["active"] = version
+        elif entry["active"] == version:
+            entry["active"] = None
+    
+    def _write_index(self) -> None:
+        """Atomically replace the offset index on disk."""
+        index_path = os.path.join(self.storage_path, self.INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, index_path)
+    
+    def _append(self, version: StrategyVersion) -> None:
+        """Append a version record to the strategy log and index its offset; the caller writes the index."""
+        record = {
+            "version": version.version,
+            "created_at": version.created_at.isoformat(),
+            "created_by": version.created_by,
+            "changelog": version.changelog,
+            "is_active": version.is_active,
+            "definition": version.definition.to_dict()
+        }
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        
+        with open(self._log_path(version.strategy_id), "ab") as f:
+            offset = f.tell()
+            f.write(line)
+        
+        entry = self._index.setdefault(version.strategy_id, {"versions": {}, "latest": None, "active": None})
+        self._index_version(entry, version.version, version.is_active, offset)
+        entry["size"] = offset + len(line)
+    
+    def _read_record(self, strategy_id: str, offset: int) -> Dict[str, Any]:
+        """Read the single log line starting at offset."""
+        with open(self._log_path(strategy_id), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = mm.find(b"\n", offset)
+                return json.loads(mm[offset:end if end != -1 else len(mm)])
+    
+    @staticmethod
+    def _version_from_record(strategy_id: str, record: Dict[str, Any]) -> StrategyVersion:
+        """Rebuild a StrategyVersion from a log record."""
+        return StrategyVersion(
+            strategy_id=strategy_id,
+            version=record["version"],
+            definition=StrategyDefinition.from_dict(record["definition"]),
+            created_at=datetime.fromisoformat(record["created_at"]),
+            created_by=record["created_by"],
+            changelog=record.get("changelog", ""),
+            is_active=record.get("is_active", False)
+        )
     
     def save(self, definition: StrategyDefinition) -> StrategyVersion:
         """Save to file system."""
-        # Implementation for file persistence
-        pass
+        return self.save_many([definition])[0]
+    
+    def save_many(self, definitions: List[StrategyDefinition]) -> List[StrategyVersion]:
+        """Append every definition, then rewrite the offset index once."""
+        # Check every id before appending so a bad id cannot leave part of the batch written
+        for definition in definitions:
+            self._check_id(definition.id)
+        versions = []
+        for definition in definitions:
+            version = StrategyVersion(
+                strategy_id=definition.id,
+                version=definition.version,
+                definition=definition,
+                created_at=datetime.now(),
+                created_by=definition.author,
+                is_active=(definition.lifecycle_state == StrategyLifecycle.ACTIVE)
+            )
+            self._append(version)
+            versions.append(version)
+        self._write_index()
+        return versions
+    
+    def get_by_id(self, strategy_id: str, version: Optional[str] = None) -> Optional[StrategyDefinition]:
+        """Get strategy by ID, reading only the requested version's record."""
+        entry = self._index.get(strategy_id)
+        if entry is None:
+            return None
+        
+        if version is None:
+            version = entry["active"] or entry["latest"]
+        offset = entry["versions"].get(version) if version else None
+        if offset is None:
+            return None
+        
+        return StrategyDefinition.from_dict(self._read_record(strategy_id, offset)["definition"])
+    
+    def list_strategies(self, 
+                       process_step: Optional[str] = None,
+                       tool_type: Optional[str] = None,
+                       lifecycle_state: Optional[StrategyLifecycle] = None) -> List[StrategyDefinition]:
+        """List strategies with filters."""
+        results = []
+        
+        for strategy_id in self._index:
+            definition = self.get_by_id(strategy_id)
+            if definition is None:
+                continue
+            
+            # Apply filters
+            if process_step and definition.process_step != process_step:
+                continue
+            if tool_type and definition.tool_type != tool_type:
+                continue
+            if lifecycle_state and definition.lifecycle_state != lifecycle_state:
+                continue
+            
+            results.append(definition)
+        
+        return results
+    
+    def get_versions(self, strategy_id: str) -> List[StrategyVersion]:
+        """Get all version records of a strategy in the order they were written."""
+        if strategy_id not in self._index:
+            return []
+        
+        with open(self._log_path(strategy_id), "rb") as f:
+            records = [self._parse_record(line) for line in f if line.strip()]
+        return [self._version_from_record(strategy_id, record) for record in records if record is not None]
+    
+    def update_lifecycle_state(self, strategy_id: str, new_state: StrategyLifecycle, user: str) -> bool:
+        """Update strategy lifecycle state by appending a new record for the current version."""
+        definition = self.get_by_id(strategy_id)
+        if definition is None:
+            return False
+        
+        definition.lifecycle_state = new_state
+        definition.modified_at = datetime.now()
+        
+        self._append(StrategyVersion(
+            strategy_id=strategy_id,
+            version=definition.version,
+            definition=definition,
+            created_at=datetime.now(),
+            created_by=user,
+            changelog=f"Lifecycle state changed to {new_state.value}",
+            is_active=(new_state == StrategyLifecycle.ACTIVE)
+        ))
+        self._write_index()
+        return True
     
-    # ... other methods would be implemented
+    def delete(self, strategy_id: str) -> bool:
+        """Soft delete strategy."""
+        definition = self.get_by_id(strategy_id)
+        if definition is None:
+            return False
+        
+        return self.update_lifecycle_state(strategy_id, StrategyLifecycle.DEPRECATED, definition.author)
 
 
 class StrategyManager:
@@ -210,6 +488,9 @@ class StrategyManager:
         if source is None:
             return None
         
+        # Rule configs and their parameters are frozen, so the clone can share them with its source
+        cloned_rules = list(source.rules)
+        
         # Create new definition based on source
         cloned = StrategyDefinition(
             name=new_name,
@@ -217,7 +498,7 @@ class StrategyManager:
             strategy_type=source.strategy_type,
             process_step=source.process_step,
             tool_type=source.tool_type,
-            rules=source.rules.copy(),
+            rules=cloned_rules,
             conditions=source.conditions,
             transformations=source.transformations,
             author=author,
@@ -6,16 +6,50 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
 
 from .config import settings
 from .core.plugins.registry import plugin_registry
 from .core.plugins.rules import RulePluginFactory
 from .api.routes import strategies, schematics
+from .api.middleware import RequestScopeMiddleware
 
 logger = logging.getLogger(__name__)
 
+# Static health fields, built once rather than per probe
+_HEALTH_BASE = {
+    "status": "healthy",
+    "environment": settings.environment,
+    "version": settings.api.version
+}
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware adding an X-Process-Time header (seconds) to responses."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Health probes and CORS preflights are not worth timing
+        if (scope["type"] != "http" or scope["method"] == "OPTIONS"
+                or scope["path"] == "/health"):
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                MutableHeaders(scope=message).append("X-Process-Time", f"{process_time:.6f}")
+            await send(message)
+        
+        await self.app(scope, receive, send_with_timing)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -55,7 +89,22 @@ def create_app() -> FastAPI:
         lifespan=lifespan
     )
     
-    # CORS middleware
+    # Compression middleware; small responses skip the compressor and responses
+    # that already carry a Content-Encoding are passed through untouched
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.api.gzip_minimum_size,
+        compresslevel=settings.api.gzip_compresslevel
+    )
+    
+    # Per-request strategy definition cache
+    app.add_middleware(RequestScopeMiddleware)
+    
+    # Request timing middleware
+    app.add_middleware(TimingMiddleware)
+    
+    # CORS middleware, registered last so it runs outermost and answers
+    # preflights before timing and compression see them
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.api.allow_origins,
@@ -64,18 +113,6 @@ def create_app() -> FastAPI:
         allow_headers=settings.api.allow_headers,
     )
     
-    # Compression middleware
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
-    
-    # Request timing middleware
-    @app.middleware("http")
-    async def add_process_time_header(request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
-    
     # Global exception handler
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
@@ -89,15 +126,10 @@ def create_app() -> FastAPI:
         )
     
     # Health check endpoint
-    @app.get("/health", tags=["health"])
+    @app.get("/health", tags=["health"], response_class=ORJSONResponse)
     async def health_check():
         """Health check endpoint."""
-        return {
-            "status": "healthy",
-            "environment": settings.environment,
-            "version": settings.api.version,
-            "timestamp": time.time()
-        }
+        return {**_HEALTH_BASE, "timestamp": time.time()}
     
     # Include routers
     app.include_router(strategies.router, prefix="/api/v1")
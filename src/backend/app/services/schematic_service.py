@@ -7,32 +7,87 @@ This service provides business logic for:
 - Converting between different schematic formats
 - Managing schematic persistence
 """
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, BinaryIO
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import List, Dict, Any, Optional, BinaryIO, Tuple
+from collections import OrderedDict
 from pathlib import Path
+import shutil
 import tempfile
-import uuid
+import threading
+import time
+from types import MappingProxyType
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import and_, delete, or_
 
 from ..core.models.schematic import (
     SchematicData, SchematicValidationResult, SchematicFormat, 
     ValidationStatus, ValidationConflict, ValidationWarning
 )
+from ..core.models._kernels import warm_up as warm_up_point_kernel
 from ..core.parsers import GDSIIParser, DXFParser, SVGParser
+from ..core.strategy.compilation import ExecutionContext
 from ..core.strategy.definition import StrategyDefinition
 from ..core.database.models import SchematicModel, SchematicValidationModel, db_manager
 
 logger = logging.getLogger(__name__)
 
+# Copy uploads to disk in 1 MiB chunks so peak memory stays flat
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Conflicts stored per validation; further conflicts are counted in an overflow warning
+_MAX_CONFLICTS = 1000
+
+_FORMAT_MAP = MappingProxyType({
+    '.gds': SchematicFormat.GDSII,
+    '.gdsii': SchematicFormat.GDSII,
+    '.dxf': SchematicFormat.DXF,
+    '.svg': SchematicFormat.SVG
+})
+
+
+def _before_cursor(date_column, id_column, after: datetime, after_id: Optional[str]):
+    """Keyset filter for rows after (after, after_id) in ``date DESC, id DESC`` order."""
+    if after_id is None:
+        return date_column < after
+    return or_(date_column < after, and_(date_column == after, id_column < after_id))
+
+
+def _file_suffix(filename: str) -> str:
+    """Return the filename's final suffix including the dot, or '' if it has none."""
+    stem, dot, ext = filename.rpartition('.')
+    return dot + ext if stem and '/' not in ext and '\\' not in ext else ''
+
 
 class SchematicService:
     """Service for managing schematic data operations."""
     
-    def __init__(self):
-        self.parsers = {
-            SchematicFormat.GDSII: GDSIIParser(),
-            SchematicFormat.DXF: DXFParser(),
-            SchematicFormat.SVG: SVGParser()
+    def __init__(self, compiler=None, cache_size: int = 32, cache_ttl: float = 300.0):
+        self._compiler = compiler
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._schematic_cache: "OrderedDict[str, Tuple[float, SchematicData]]" = OrderedDict()
+        # Service calls run in worker threads; the lock keeps LRU bookkeeping consistent
+        self._cache_lock = threading.Lock()
+        # One worker per CPU bounds heavy calls without tying the service to an event loop
+        self._cpu_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                thread_name_prefix="schematic-cpu")
+        # Parsers are built on first use so unused formats cost nothing at startup
+        self._parser_factories = {
+            SchematicFormat.GDSII: GDSIIParser,
+            SchematicFormat.DXF: DXFParser,
+            SchematicFormat.SVG: SVGParser
         }
+        self._parsers = {}
+        
+        # Compile the point classification kernel now rather than on the first validation
+        warm_up_point_kernel()
         
         # Initialize database tables
         try:
@@ -40,6 +95,14 @@ class SchematicService:
         except Exception as e:
             logger.warning(f"Could not initialize database tables: {e}")
     
+    @property
+    def compiler(self):
+        """Strategy compiler, shared with the strategy service so both hit one compilation cache."""
+        if self._compiler is None:
+            from .strategy_service import get_strategy_service
+            self._compiler = get_strategy_service().compiler
+        return self._compiler
+    
     def upload_schematic(self, file_content: BinaryIO, filename: str, 
                         created_by: str, **kwargs) -> SchematicData:
         """
@@ -59,16 +122,14 @@ class SchematicService:
         # Detect format from filename
         file_format = self._detect_format(filename)
         if file_format == SchematicFormat.UNKNOWN:
-            raise ValueError(f"Unsupported file format: {Path(filename).suffix}")
+            raise ValueError(f"Unsupported file format: {_file_suffix(filename)}")
         
         # Get appropriate parser
-        parser = self.parsers.get(file_format)
-        if not parser:
-            raise ValueError(f"No parser available for format: {file_format}")
+        parser = self._get_parser(file_format)
         
-        # Save to temporary file for parsing
-        with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as temp_file:
-            temp_file.write(file_content.read())
+        # Stream to temporary file for parsing; the parsers need a real path
+        with tempfile.NamedTemporaryFile(suffix=_file_suffix(filename), delete=False) as temp_file:
+            shutil.copyfileobj(file_content, temp_file, _UPLOAD_CHUNK_SIZE)
             temp_path = temp_file.name
         
         try:
@@ -93,7 +154,22 @@ class SchematicService:
                 pass
     
     def get_schematic(self, schematic_id: str) -> Optional[SchematicData]:
-        """Get schematic data by ID."""
+        """
+        Get schematic data by ID.
+        
+        Loaded schematics are cached with their wafer map and spatial index
+        prebuilt, so callers must treat the returned object as read-only.
+        """
+        # Check cache first
+        with self._cache_lock:
+            cached = self._schematic_cache.get(schematic_id)
+            if cached is not None:
+                expires_at, schematic = cached
+                if time.monotonic() < expires_at:
+                    self._schematic_cache.move_to_end(schematic_id)
+                    return schematic
+                self._schematic_cache.pop(schematic_id, None)
+        
         try:
             session = db_manager.get_session()
             schematic_model = session.query(SchematicModel).filter(
@@ -101,7 +177,17 @@ class SchematicService:
             ).first()
             
             if schematic_model:
-                return schematic_model.to_schematic_data()
+                schematic = schematic_model.to_schematic_data()
+                
+                # Hydrate derived structures once so every cached use shares them
+                schematic.to_wafer_map()
+                schematic.spatial_index
+                
+                with self._cache_lock:
+                    self._schematic_cache[schematic_id] = (time.monotonic() + self.cache_ttl, schematic)
+                    if len(self._schematic_cache) > self.cache_size:
+                        self._schematic_cache.popitem(last=False)
+                return schematic
             
         except Exception as e:
             logger.error(f"Error retrieving schematic {schematic_id}: {e}")
@@ -110,19 +196,39 @@ class SchematicService:
     
     def list_schematics(self, created_by: Optional[str] = None, 
                        format_type: Optional[SchematicFormat] = None,
-                       limit: int = 100) -> List[Dict[str, Any]]:
-        """List available schematics with metadata."""
+                       limit: int = 100,
+                       after: Optional[datetime] = None,
+                       after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List available schematics with metadata, newest first.
+        
+        Pass the upload_date and id of the last item as ``after`` and ``after_id`` to fetch the next page.
+        """
         try:
-            session = db_manager.get_session()
-            query = session.query(SchematicModel)
-            
-            if created_by:
-                query = query.filter(SchematicModel.created_by == created_by)
-            
-            if format_type:
-                query = query.filter(SchematicModel.format_type == format_type.value)
-            
-            schematics = query.order_by(SchematicModel.upload_date.desc()).limit(limit).all()
+            with db_manager.session_scope() as session:
+                # Project only the listed columns so die boundary JSON is never loaded
+                query = session.query(
+                    SchematicModel.id,
+                    SchematicModel.filename,
+                    SchematicModel.format_type,
+                    SchematicModel.upload_date,
+                    SchematicModel.die_count,
+                    SchematicModel.available_die_count,
+                    SchematicModel.wafer_size,
+                    SchematicModel.created_by
+                )
+                
+                if created_by:
+                    query = query.filter(SchematicModel.created_by == created_by)
+                
+                if format_type:
+                    query = query.filter(SchematicModel.format_type == format_type.value)
+                
+                if after:
+                    query = query.filter(_before_cursor(SchematicModel.upload_date, SchematicModel.id, after, after_id))
+                
+                # The id tie-breaker keeps rows that share a timestamp from straddling pages
+                rows = query.order_by(SchematicModel.upload_date.desc(), SchematicModel.id.desc()).limit(limit).all()
             
             return [
                 {
@@ -135,7 +241,7 @@ class SchematicService:
                     'wafer_size': s.wafer_size,
                     'created_by': s.created_by
                 }
-                for s in schematics
+                for s in rows
             ]
             
         except Exception as e:
@@ -156,13 +262,45 @@ class SchematicService:
         Returns:
             SchematicValidationResult with validation details
         """
-        logger.info(f"Validating strategy {strategy.id} against schematic {schematic_id}")
-        
         # Get schematic data
         schematic = self.get_schematic(schematic_id)
         if not schematic:
             raise ValueError(f"Schematic not found: {schematic_id}")
         
+        return self._validate_one(strategy, schematic, schematic_id, validated_by)
+    
+    def validate_strategies(self, strategies: List[StrategyDefinition],
+                            schematic_id: str,
+                            validated_by: str) -> List[SchematicValidationResult]:
+        """
+        Validate several strategies against the same schematic.
+        
+        The schematic is loaded once and its wafer map and spatial index are
+        shared by every strategy; each strategy compiles through the shared
+        compiler cache.
+        
+        Args:
+            strategies: Strategies to validate
+            schematic_id: ID of schematic to validate against
+            validated_by: User performing validation
+        
+        Returns:
+            One SchematicValidationResult per strategy, in input order
+        """
+        schematic = self.get_schematic(schematic_id)
+        if not schematic:
+            raise ValueError(f"Schematic not found: {schematic_id}")
+        
+        return [
+            self._validate_one(strategy, schematic, schematic_id, validated_by)
+            for strategy in strategies
+        ]
+    
+    def _validate_one(self, strategy: StrategyDefinition, schematic: SchematicData,
+                      schematic_id: str, validated_by: str) -> SchematicValidationResult:
+        """Validate one strategy against an already loaded schematic."""
+        logger.info(f"Validating strategy {strategy.id} against schematic {schematic_id}")
+        
         # Create validation result
         validation_result = SchematicValidationResult(
             schematic_id=schematic_id,
@@ -171,48 +309,77 @@ class SchematicService:
         )
         
         try:
-            # Compile strategy to get sampling points
-            from ..core.strategy.compilation import StrategyCompiler
-            compiler = StrategyCompiler()
+            # Compile strategy to get sampling points; repeat validations hit the compiler's cache
+            compiled_strategy = self.compiler.compile(strategy)
             
             # Convert schematic to wafer map for strategy execution
             wafer_map = schematic.to_wafer_map()
-            compiled_strategy = compiler.compile_strategy(strategy)
             
             # Execute strategy to get sampling points
-            execution_context = compiler.create_execution_context(wafer_map, {})
+            execution_context = ExecutionContext(
+                wafer_map=wafer_map,
+                process_parameters={},
+                tool_constraints={}
+            )
             sampling_points = compiled_strategy.execute(execution_context)
             
-            # Validate each sampling point against schematic
+            # Validate all sampling points against schematic in one vectorized lookup
             validation_result.total_strategy_points = len(sampling_points)
-            valid_points = 0
-            
-            for point in sampling_points:
-                die_boundary = schematic.get_die_at_coordinates(point.x, point.y)
-                
-                if die_boundary is None:
+            xs = np.fromiter((point.x for point in sampling_points), dtype=np.float64, count=len(sampling_points))
+            ys = np.fromiter((point.y for point in sampling_points), dtype=np.float64, count=len(sampling_points))
+            die_idx = schematic.get_die_indices(xs, ys)
+            
+            out_of_bounds = die_idx < 0
+            unavailable = ~out_of_bounds
+            unavailable[unavailable] = ~schematic.spatial_index.available[die_idx[unavailable]]
+            # Unavailable dies count as valid but with warning
+            valid_points = len(sampling_points) - int(out_of_bounds.sum())
+            
+            # Only flagged points need conflict objects; build them in point order and append in one batch
+            conflicts = []
+            append = conflicts.append
+            die_boundaries = schematic.die_boundaries
+            # Severity totals come from the full masks; past the cap, flagged points are only counted.
+            # Errors claim cap slots before warnings, and the kept points are listed in point order.
+            error_idx = np.flatnonzero(out_of_bounds)
+            warning_idx = np.flatnonzero(unavailable)
+            listed_errors = error_idx[:_MAX_CONFLICTS]
+            listed_warnings = warning_idx[:_MAX_CONFLICTS - listed_errors.size]
+            flagged = np.sort(np.concatenate((listed_errors, listed_warnings)))
+            overflow = error_idx.size + warning_idx.size - flagged.size
+            for i in flagged.tolist():
+                point = sampling_points[i]
+                if out_of_bounds[i]:
                     # Point is outside any die boundary
-                    validation_result.add_conflict(
+                    append(ValidationConflict(
                         conflict_type="out_of_bounds",
                         strategy_point=(point.x, point.y),
                         description=f"Strategy point ({point.x}, {point.y}) is outside all die boundaries",
                         severity="error",
                         recommendation="Adjust strategy rules to stay within die boundaries"
-                    )
-                elif not die_boundary.available:
+                    ))
+                else:
                     # Point is on an unavailable die
-                    validation_result.add_conflict(
+                    die_id = die_boundaries[die_idx[i]].die_id
+                    append(ValidationConflict(
                         conflict_type="unavailable_die",
                         strategy_point=(point.x, point.y),
-                        description=f"Strategy point ({point.x}, {point.y}) targets unavailable die {die_boundary.die_id}",
+                        description=f"Strategy point ({point.x}, {point.y}) targets unavailable die {die_id}",
                         severity="warning",
                         recommendation="Consider marking die as available or adjust strategy",
-                        affected_die_id=die_boundary.die_id
-                    )
-                    valid_points += 1  # Count as valid but with warning
-                else:
-                    # Point is valid
-                    valid_points += 1
+                        affected_die_id=die_id
+                    ))
+            validation_result.add_conflicts(conflicts)
+            validation_result.add_unlisted_conflicts(
+                error_count=int(error_idx.size - listed_errors.size),
+                warning_count=int(warning_idx.size - listed_warnings.size)
+            )
+            if overflow:
+                validation_result.add_warning(
+                    warning_type="conflict_overflow",
+                    description=f"{overflow} additional conflicts suppressed after the first {_MAX_CONFLICTS}",
+                    recommendation="Fix the reported conflicts and re-validate to see the rest"
+                )
             
             validation_result.valid_strategy_points = valid_points
             validation_result.coverage_percentage = (valid_points / len(sampling_points) * 100) if sampling_points else 0
@@ -274,19 +441,46 @@ class SchematicService:
     
     def list_validation_results(self, schematic_id: Optional[str] = None,
                                strategy_id: Optional[str] = None,
-                               limit: int = 50) -> List[Dict[str, Any]]:
-        """List validation results with summary information."""
+                               limit: int = 50,
+                               after: Optional[datetime] = None,
+                               after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List validation results with summary information, newest first.
+        
+        Pass the validation_date and validation_id of the last item as ``after`` and ``after_id``
+        to fetch the next page.
+        """
         try:
-            session = db_manager.get_session()
-            query = session.query(SchematicValidationModel)
-            
-            if schematic_id:
-                query = query.filter(SchematicValidationModel.schematic_id == schematic_id)
-            
-            if strategy_id:
-                query = query.filter(SchematicValidationModel.strategy_id == strategy_id)
-            
-            validations = query.order_by(SchematicValidationModel.validation_date.desc()).limit(limit).all()
+            with db_manager.session_scope() as session:
+                # Project only the summary columns so conflict/warning JSON is never loaded
+                query = session.query(
+                    SchematicValidationModel.validation_id,
+                    SchematicValidationModel.schematic_id,
+                    SchematicValidationModel.strategy_id,
+                    SchematicValidationModel.validation_date,
+                    SchematicValidationModel.validation_status,
+                    SchematicValidationModel.alignment_score,
+                    SchematicValidationModel.coverage_percentage,
+                    SchematicValidationModel.total_strategy_points,
+                    SchematicValidationModel.valid_strategy_points,
+                    SchematicValidationModel.validated_by
+                )
+                
+                if schematic_id:
+                    query = query.filter(SchematicValidationModel.schematic_id == schematic_id)
+                
+                if strategy_id:
+                    query = query.filter(SchematicValidationModel.strategy_id == strategy_id)
+                
+                if after:
+                    query = query.filter(_before_cursor(
+                        SchematicValidationModel.validation_date, SchematicValidationModel.validation_id,
+                        after, after_id
+                    ))
+                
+                rows = query.order_by(
+                    SchematicValidationModel.validation_date.desc(), SchematicValidationModel.validation_id.desc()
+                ).limit(limit).all()
             
             return [
                 {
@@ -301,7 +495,7 @@ class SchematicService:
                     'valid_points': v.valid_strategy_points,
                     'validated_by': v.validated_by
                 }
-                for v in validations
+                for v in rows
             ]
             
         except Exception as e:
@@ -333,46 +527,102 @@ class SchematicService:
     def delete_schematic(self, schematic_id: str) -> bool:
         """Delete a schematic and all associated validation results."""
         try:
-            session = db_manager.get_session()
-            
-            # Delete validation results first
-            session.query(SchematicValidationModel).filter(
-                SchematicValidationModel.schematic_id == schematic_id
-            ).delete()
-            
-            # Delete schematic
-            deleted_count = session.query(SchematicModel).filter(
-                SchematicModel.id == schematic_id
-            ).delete()
-            
-            session.commit()
+            with db_manager.session_scope() as session:
+                # Delete validation results first; Core deletes skip loading ORM objects
+                session.execute(
+                    delete(SchematicValidationModel).where(
+                        SchematicValidationModel.schematic_id == schematic_id
+                    )
+                )
+                
+                # Delete schematic
+                result = session.execute(
+                    delete(SchematicModel).where(SchematicModel.id == schematic_id)
+                )
+            with self._cache_lock:
+                self._schematic_cache.pop(schematic_id, None)
             
-            return deleted_count > 0
+            return result.rowcount > 0
             
         except Exception as e:
             logger.error(f"Error deleting schematic {schematic_id}: {e}")
             return False
     
+    # Async variants: run the blocking parse, validation and DB work in worker threads
+    # so request handlers do not stall the event loop. CPU-heavy calls share a
+    # worker pool sized to the CPU count to avoid oversubscribing the threadpool.
+    
+    async def _run_cpu_bound(self, func, *args, **kwargs):
+        """Run a CPU-heavy call on the bounded worker pool with the caller's context."""
+        call = partial(copy_context().run, partial(func, *args, **kwargs))
+        return await asyncio.get_running_loop().run_in_executor(self._cpu_executor, call)
+    
+    async def upload_schematic_async(self, file_content: BinaryIO, filename: str,
+                                     created_by: str, **kwargs) -> SchematicData:
+        """Async variant of upload_schematic."""
+        return await self._run_cpu_bound(self.upload_schematic, file_content, filename, created_by, **kwargs)
+    
+    async def get_schematic_async(self, schematic_id: str) -> Optional[SchematicData]:
+        """Async variant of get_schematic."""
+        return await asyncio.to_thread(self.get_schematic, schematic_id)
+    
+    async def list_schematics_async(self, **kwargs) -> List[Dict[str, Any]]:
+        """Async variant of list_schematics."""
+        return await asyncio.to_thread(self.list_schematics, **kwargs)
+    
+    async def validate_strategy_against_schematic_async(self, strategy: StrategyDefinition,
+                                                        schematic_id: str,
+                                                        validated_by: str) -> SchematicValidationResult:
+        """Async variant of validate_strategy_against_schematic."""
+        return await self._run_cpu_bound(self.validate_strategy_against_schematic,
+                                         strategy, schematic_id, validated_by)
+    
+    async def validate_strategies_async(self, strategies: List[StrategyDefinition],
+                                        schematic_id: str,
+                                        validated_by: str) -> List[SchematicValidationResult]:
+        """Async variant of validate_strategies."""
+        return await self._run_cpu_bound(self.validate_strategies, strategies, schematic_id, validated_by)
+    
+    async def get_validation_result_async(self, validation_id: str) -> Optional[SchematicValidationResult]:
+        """Async variant of get_validation_result."""
+        return await asyncio.to_thread(self.get_validation_result, validation_id)
+    
+    async def list_validation_results_async(self, **kwargs) -> List[Dict[str, Any]]:
+        """Async variant of list_validation_results."""
+        return await asyncio.to_thread(self.list_validation_results, **kwargs)
+    
+    async def export_schematic_async(self, schematic_id: str, target_format: SchematicFormat) -> bytes:
+        """Async variant of export_schematic."""
+        return await self._run_cpu_bound(self.export_schematic, schematic_id, target_format)
+    
+    async def delete_schematic_async(self, schematic_id: str) -> bool:
+        """Async variant of delete_schematic."""
+        return await asyncio.to_thread(self.delete_schematic, schematic_id)
+    
+    def _get_parser(self, file_format: SchematicFormat):
+        """Get the parser for a format, instantiating it on first use."""
+        parser = self._parsers.get(file_format)
+        if parser is None:
+            factory = self._parser_factories.get(file_format)
+            if factory is None:
+                raise ValueError(f"No parser available for format: {file_format}")
+            try:
+                parser = self._parsers.setdefault(file_format, factory())
+            except ImportError as e:
+                raise ValueError(f"No parser available for format: {file_format} ({e})")
+        return parser
+    
     def _detect_format(self, filename: str) -> SchematicFormat:
         """Detect schematic format from filename."""
-        suffix = Path(filename).suffix.lower()
-        
-        format_map = {
-            '.gds': SchematicFormat.GDSII,
-            '.gdsii': SchematicFormat.GDSII,
-            '.dxf': SchematicFormat.DXF,
-            '.svg': SchematicFormat.SVG
-        }
-        
-        return format_map.get(suffix, SchematicFormat.UNKNOWN)
+        return _FORMAT_MAP.get(_file_suffix(filename).lower(), SchematicFormat.UNKNOWN)
     
     def _save_schematic(self, schematic_data: SchematicData, created_by: str):
         """Save schematic data to database."""
         try:
-            session = db_manager.get_session()
-            schematic_model = SchematicModel.from_schematic_data(schematic_data, created_by)
-            session.add(schematic_model)
-            session.commit()
+            with db_manager.session_scope() as session:
+                session.add(SchematicModel.from_schematic_data(schematic_data, created_by))
+            with self._cache_lock:
+                self._schematic_cache.pop(schematic_data.id, None)
         except Exception as e:
             logger.error(f"Error saving schematic to database: {e}")
             # Continue without database persistence
@@ -380,10 +630,8 @@ class SchematicService:
     def _save_validation_result(self, validation_result: SchematicValidationResult, validated_by: str):
         """Save validation result to database."""
         try:
-            session = db_manager.get_session()
-            validation_model = SchematicValidationModel.from_validation_result(validation_result, validated_by)
-            session.add(validation_model)
-            session.commit()
+            with db_manager.session_scope() as session:
+                session.add(SchematicValidationModel.from_validation_result(validation_result, validated_by))
         except Exception as e:
             logger.error(f"Error saving validation result to database: {e}")
             # Continue without database persistence
@@ -399,7 +647,7 @@ class SchematicService:
         if validation_result.coverage_percentage < 80:
             recommendations.append("Increase sampling density to improve wafer coverage")
         
-        error_count = len([c for c in validation_result.conflicts if c.severity == "error"])
+        error_count = validation_result.error_count
         if error_count > 0:
             recommendations.append(f"Fix {error_count} critical errors before deploying strategy")
         
@@ -415,28 +663,29 @@ class SchematicService:
         width = bounds[2] - bounds[0]
         height = bounds[3] - bounds[1]
         
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+        parts = [f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg xmlns="http://www.w3.org/2000/svg" 
      viewBox="{bounds[0]} {bounds[1]} {width} {height}"
      width="{width}" height="{height}">
   <title>{schematic.filename} - Die Layout</title>
   <desc>Wafer layout with {len(schematic.die_boundaries)} dies</desc>
-'''
+''']
+        append = parts.append
         
-        # Add die rectangles
+        # Add die rectangles; collected in a list and joined once to avoid quadratic concatenation
         for die in schematic.die_boundaries:
             color = "#4CAF50" if die.available else "#F44336"
-            svg_content += f'''  <rect x="{die.x_min}" y="{die.y_min}" 
+            append(f'''  <rect x="{die.x_min}" y="{die.y_min}" 
        width="{die.width}" height="{die.height}"
        fill="{color}" stroke="#333" stroke-width="1" opacity="0.7"/>
   <text x="{die.center_x}" y="{die.center_y}" 
         text-anchor="middle" dominant-baseline="central" 
         font-size="8" fill="white">{die.die_id}</text>
-'''
+''')
         
-        svg_content += '</svg>'
+        append('</svg>')
         
-        return svg_content.encode('utf-8')
+        return ''.join(parts).encode('utf-8')
     
     def _export_to_dxf(self, schematic: SchematicData) -> bytes:
         """Export schematic data as DXF."""
@@ -447,6 +696,15 @@ class SchematicService:
             doc = ezdxf.new('R2010')
             msp = doc.modelspace()
             
+            # Create layers once up front and share their attribute dicts across dies
+            for layer_name in ("AVAILABLE_DIES", "UNAVAILABLE_DIES", "TEXT"):
+                if layer_name not in doc.layers:
+                    doc.layers.new(layer_name)
+            available_attribs = {'layer': 'AVAILABLE_DIES'}
+            unavailable_attribs = {'layer': 'UNAVAILABLE_DIES'}
+            add_lwpolyline = msp.add_lwpolyline
+            add_text = msp.add_text
+            
             # Add die rectangles
             for die in schematic.die_boundaries:
                 # Create rectangle
@@ -458,20 +716,19 @@ class SchematicService:
                     (die.x_min, die.y_min)  # Close the rectangle
                 ]
                 
-                layer_name = "AVAILABLE_DIES" if die.available else "UNAVAILABLE_DIES"
-                
-                # Ensure layer exists
-                if layer_name not in doc.layers:
-                    doc.layers.new(layer_name)
-                
                 # Add polyline
-                msp.add_lwpolyline(points, close=True, dxfattribs={'layer': layer_name})
+                add_lwpolyline(points, close=True,
+                               dxfattribs=available_attribs if die.available else unavailable_attribs)
                 
-                # Add text label
-                msp.add_text(
+                # Add text label, placed at construction instead of a separate set_pos call
+                add_text(
                     die.die_id,
-                    dxfattribs={'layer': 'TEXT', 'height': min(die.width, die.height) * 0.1}
-                ).set_pos((die.center_x, die.center_y))
+                    dxfattribs={
+                        'layer': 'TEXT',
+                        'height': min(die.width, die.height) * 0.1,
+                        'insert': (die.center_x, die.center_y)
+                    }
+                )
             
             # Save to bytes
             import io
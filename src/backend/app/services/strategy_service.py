@@ -1,19 +1,57 @@
 """
 Strategy Service - Business logic layer for strategy operations.
 """
-from typing import List, Optional, Dict, Any
-import uuid
+from typing import Iterator, List, Optional, Dict, Any, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import partial
+import asyncio
+import dataclasses
+import logging
+import os
+import threading
 from datetime import datetime
 
-from ..core.strategy.definition import StrategyDefinition, StrategyType, StrategyLifecycle
+import numpy as np
+
+from ..core.strategy.definition import StrategyDefinition, StrategyType, StrategyLifecycle, RuleConfig
 from ..core.strategy.repository import StrategyManager, InMemoryStrategyRepository, StrategyVersion
-from ..core.strategy.compilation import StrategyCompiler, ExecutionContext, RuleFactory
+from ..core.strategy.compilation import (
+    StrategyCompiler, ExecutionContext, RuleFactory, CompilationError, ExecutionError
+)
 from ..core.models.wafer_map import WaferMap
 from ..core.models.die import Die
+from ..core.models._rule_kernels import warm_up as warm_up_rule_kernels
 from ..core.plugins.registry import plugin_registry
 from ..core.plugins.rules import RulePluginFactory
 from ..core.database.repository import get_database_repository
 
+logger = logging.getLogger(__name__)
+
+# Rule parameters that make warm-up reach each rule's kernel rather than an early return
+_WARMUP_PARAMETERS: Dict[str, Dict[str, Any]] = {
+    "fixed_point": {"points": [[0, 0]]}
+}
+
+# Request-scoped identity map of fetched definitions; unset outside request_scope()
+_request_definitions: ContextVar[Optional[Dict[Tuple[str, Optional[str]], StrategyDefinition]]] = ContextVar(
+    "request_definitions", default=None
+)
+
+# Definitions saved inside StrategyService.batch(), keyed by id so repeat saves coalesce
+_pending_saves: ContextVar[Optional[Dict[str, StrategyDefinition]]] = ContextVar("pending_saves", default=None)
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """Share fetched strategy definitions across one request; worker threads inherit the scope."""
+    token = _request_definitions.set({})
+    try:
+        yield
+    finally:
+        _request_definitions.reset(token)
+
 
 class StrategyService:
     """High-level service for strategy management and execution."""
@@ -42,6 +80,23 @@ class StrategyService:
         plugin_rule_factory = RulePluginFactory(plugin_registry)
         self.rule_factory = RuleFactory(plugin_rule_factory)
         self.compiler = compiler or StrategyCompiler(self.rule_factory)
+        
+        # One worker per CPU bounds simulations without tying the service to an event loop
+        self._cpu_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                thread_name_prefix="strategy-simulate")
+    
+    def _warm_up(self):
+        """Build and run one rule per rule type so JIT kernels and plugins are ready before the first request."""
+        try:
+            warm_up_rule_kernels()
+            wafer_map = WaferMap.from_arrays(np.arange(3), np.zeros(3, dtype=np.int64), np.ones(3, dtype=bool))
+            context = ExecutionContext(wafer_map, {}, {}, execution_id="warmup")
+            # Rules go through the factory only; no warm-up strategy takes a compilation cache slot
+            for rule_type in sorted(self.rule_factory.get_available_rule_types()):
+                rule_config = RuleConfig.get_or_create(rule_type, _WARMUP_PARAMETERS.get(rule_type, {}))
+                self.rule_factory.create_rule(rule_config).apply(wafer_map, context)
+        except Exception as e:
+            logger.warning(f"Strategy warm-up failed: {e}")
     
     def create_strategy(self,
                        name: str,
@@ -66,12 +121,45 @@ class StrategyService:
         if errors:
             raise ValueError(f"Strategy validation failed: {', '.join(errors)}")
         
-        self.repository.save(definition)
+        self._save(definition)
         return definition
     
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Coalesce strategy saves made inside the block into one repository write on exit.
+        Nothing is written if the outermost block raises. Nested batches join the outermost
+        one, so an inner block's saves are still written with it even if that inner block raised.
+        """
+        if _pending_saves.get() is not None:
+            yield
+            return
+        
+        token = _pending_saves.set({})
+        try:
+            yield
+            pending = _pending_saves.get()
+        finally:
+            _pending_saves.reset(token)
+        if pending:
+            self.repository.save_many(list(pending.values()))
+            for definition in pending.values():
+                self._remember_definition(definition)
+    
+    def bulk_update(self, updates: List[Tuple[str, Dict[str, Any]]]) -> List[StrategyDefinition]:
+        """Apply several strategy updates and persist them together; any failure leaves all unsaved."""
+        with self.batch():
+            definitions = []
+            for strategy_id, strategy_updates in updates:
+                definition = self.update_strategy(strategy_id, strategy_updates)
+                if definition is None:
+                    raise ValueError(f"Strategy not found: {strategy_id}")
+                definitions.append(definition)
+        return definitions
+    
     def get_strategy(self, strategy_id: str, version: Optional[str] = None) -> Optional[StrategyDefinition]:
         """Get strategy by ID and optional version."""
-        return self.repository.get_by_id(strategy_id, version)
+        return self._get_by_id(strategy_id, version)
     
     def list_strategies(self,
                        process_step: Optional[str] = None,
@@ -81,10 +169,12 @@ class StrategyService:
         return self.repository.list_strategies(process_step, tool_type, lifecycle_state)
     
     def update_strategy(self, strategy_id: str, updates: Dict[str, Any]) -> Optional[StrategyDefinition]:
-        """Update strategy definition."""
-        definition = self.repository.get_by_id(strategy_id)
-        if definition is None:
+        """Update strategy definition; the stored definition only changes once the edited copy is saved."""
+        stored = self._get_by_id(strategy_id)
+        if stored is None:
             return None
+        # Repositories may hand out the stored object itself, so edit a copy; rule configs are frozen and shared
+        definition = dataclasses.replace(stored, rules=list(stored.rules))
         
         # Apply updates
         if 'name' in updates:
@@ -96,7 +186,7 @@ class StrategyService:
             from ..core.strategy.definition import RuleConfig
             rule_configs = []
             for rule_data in updates['rules']:
-                rule_config = RuleConfig(
+                rule_config = RuleConfig.get_or_create(
                     rule_type=rule_data.get('rule_type', 'fixed_point'),
                     parameters=rule_data.get('parameters', {}),
                     weight=rule_data.get('weight', 1.0),
@@ -118,7 +208,7 @@ class StrategyService:
         if errors:
             raise ValueError(f"Strategy validation failed: {', '.join(errors)}")
         
-        self.repository.save(definition)
+        self._save(definition)
         return definition
     
     def clone_strategy(self, source_id: str, new_name: str, author: str) -> Optional[StrategyDefinition]:
@@ -127,10 +217,12 @@ class StrategyService:
     
     def promote_strategy(self, strategy_id: str, user: str) -> bool:
         """Promote strategy through lifecycle states."""
+        self._forget_definition(strategy_id)
         return self.manager.promote_strategy(strategy_id, user)
     
     def delete_strategy(self, strategy_id: str) -> bool:
         """Delete (deprecate) a strategy."""
+        self._forget_definition(strategy_id)
         return self.repository.delete(strategy_id)
     
     def get_strategy_versions(self, strategy_id: str) -> List[StrategyVersion]:
@@ -141,10 +233,14 @@ class StrategyService:
                          strategy_id: str,
                          wafer_map_data: Dict[str, Any],
                          process_parameters: Dict[str, Any],
-                         tool_constraints: Dict[str, Any]) -> Dict[str, Any]:
-        """Simulate strategy execution and return detailed results."""
+                         tool_constraints: Dict[str, Any],
+                         columnar: bool = False) -> Dict[str, Any]:
+        """
+        Simulate strategy execution and return detailed results.
+        With columnar=True, selected_points is returned as parallel x/y/available lists.
+        """
         # Get strategy definition
-        definition = self.repository.get_by_id(strategy_id)
+        definition = self._get_by_id(strategy_id)
         if definition is None:
             raise ValueError("Strategy not found")
         
@@ -156,90 +252,172 @@ class StrategyService:
             wafer_map=wafer_map,
             process_parameters=process_parameters,
             tool_constraints=tool_constraints,
-            execution_id=str(uuid.uuid4()),
-            timestamp=datetime.now().isoformat(),
             wafer_size=process_parameters.get('wafer_size'),
             product_type=process_parameters.get('product_type'),
             process_layer=process_parameters.get('process_layer')
         )
         
+        # Invalid definitions are reported up front rather than raised from the compiler
+        errors = definition.validate()
+        if errors:
+            return self._failed_simulation(f"Strategy validation failed: {errors}", columnar)
+        
         try:
-            # Compile strategy
             compiled_strategy = self.compiler.compile(definition)
-            
-            # Execute simulation
+        except CompilationError as e:
+            return self._failed_simulation(str(e), columnar)
+        
+        try:
             selected_dies = compiled_strategy.execute(context)
-            
-            # Calculate coverage statistics
-            coverage_stats = self._calculate_coverage_stats(wafer_map, selected_dies)
-            
-            # Get performance metrics
-            performance_metrics = compiled_strategy.performance_estimate
-            
-            return {
-                "selected_points": [
-                    {"x": die.x, "y": die.y, "available": die.available}
-                    for die in selected_dies
-                ],
-                "coverage_stats": coverage_stats,
-                "performance_metrics": performance_metrics,
-                "warnings": []  # Would include any warnings from execution
-            }
+        except ExecutionError as e:
+            return self._failed_simulation(str(e), columnar)
         
-        except Exception as e:
+        return {
+            "selected_points": self._serialize_points(selected_dies, columnar),
+            "coverage_stats": self._calculate_coverage_stats(wafer_map, selected_dies),
+            "performance_metrics": compiled_strategy.performance_estimate,
+            "warnings": []  # Would include any warnings from execution
+        }
+    
+    def _failed_simulation(self, reason: str, columnar: bool) -> Dict[str, Any]:
+        """Empty simulation result carrying the failure as a warning."""
+        return {
+            "selected_points": self._serialize_points([], columnar),
+            "coverage_stats": {},
+            "performance_metrics": {},
+            "warnings": [f"Simulation failed: {reason}"]
+        }
+    
+    async def simulate_strategy_async(self,
+                                      strategy_id: str,
+                                      wafer_map_data: Dict[str, Any],
+                                      process_parameters: Dict[str, Any],
+                                      tool_constraints: Dict[str, Any],
+                                      columnar: bool = False) -> Dict[str, Any]:
+        """Async variant of simulate_strategy, run on the bounded worker pool."""
+        # Carry the caller's context so request and batch scopes still apply in the worker
+        call = partial(copy_context().run, self.simulate_strategy, strategy_id, wafer_map_data,
+                       process_parameters, tool_constraints, columnar)
+        return await asyncio.get_running_loop().run_in_executor(self._cpu_executor, call)
+    
+    async def simulate_strategies_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run several simulations concurrently, at most one per CPU at a time.
+        Each request holds simulate_strategy's keyword arguments; results keep request order.
+        """
+        return list(await asyncio.gather(*(self.simulate_strategy_async(**request) for request in requests)))
+    
+    @staticmethod
+    def _serialize_points(dies: List[Die], columnar: bool) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]:
+        """Serialize selected dies as one record per die, or as parallel columns."""
+        if columnar:
             return {
-                "selected_points": [],
-                "coverage_stats": {},
-                "performance_metrics": {},
-                "warnings": [f"Simulation failed: {str(e)}"]
+                "x": [die.x for die in dies],
+                "y": [die.y for die in dies],
+                "available": [die.available for die in dies]
             }
+        return [{"x": die.x, "y": die.y, "available": die.available} for die in dies]
     
-    def _create_wafer_map_from_data(self, wafer_map_data: Dict[str, Any]) -> WaferMap:
-        """Create WaferMap object from data dictionary."""
-        dies = []
+    def _get_by_id(self, strategy_id: str, version: Optional[str] = None) -> Optional[StrategyDefinition]:
+        """Fetch a definition, preferring unsaved batch edits, then the current request scope."""
+        pending = _pending_saves.get()
+        if pending and version is None and strategy_id in pending:
+            return pending[strategy_id]
         
-        # Handle different input formats
-        if 'dies' in wafer_map_data:
-            for die_data in wafer_map_data['dies']:
-                die = Die(
-                    x=die_data['x'],
-                    y=die_data['y'],
-                    available=die_data.get('available', True)
-                )
-                dies.append(die)
-        elif 'grid_size' in wafer_map_data:
-            # Generate grid-based wafer map
-            size = wafer_map_data['grid_size']
-            for x in range(size):
-                for y in range(size):
-                    dies.append(Die(x, y, True))
+        definitions = _request_definitions.get()
+        if definitions is None:
+            return self.repository.get_by_id(strategy_id, version)
+        
+        key = (strategy_id, version)
+        definition = definitions.get(key)
+        if definition is None:
+            definition = self.repository.get_by_id(strategy_id, version)
+            if definition is not None:
+                definitions[key] = definition
+        return definition
+    
+    def _save(self, definition: StrategyDefinition):
+        """Persist a definition now, or queue it when inside batch()."""
+        pending = _pending_saves.get()
+        if pending is None:
+            self.repository.save(definition)
+            self._remember_definition(definition)
         else:
-            # Default 5x5 grid
-            for x in range(5):
-                for y in range(5):
-                    dies.append(Die(x, y, True))
+            pending[definition.id] = definition
+    
+    @staticmethod
+    def _remember_definition(definition: StrategyDefinition):
+        """Make a just-saved definition the current request scope's latest copy of its strategy."""
+        definitions = _request_definitions.get()
+        if definitions is not None:
+            StrategyService._forget_definition(definition.id)
+            definitions[(definition.id, None)] = definition
+    
+    @staticmethod
+    def _forget_definition(strategy_id: str):
+        """Drop a strategy's definitions from the current request scope."""
+        definitions = _request_definitions.get()
+        if definitions:
+            for key in [key for key in definitions if key[0] == strategy_id]:
+                del definitions[key]
+    
+    def _create_wafer_map_from_data(self, wafer_map_data: Dict[str, Any]) -> WaferMap:
+        """Create WaferMap object from data dictionary; malformed data raises ValueError."""
+        # Handle different input formats; both branches build the coordinate arrays directly
+        if 'dies' in wafer_map_data:
+            dies_data = wafer_map_data['dies']
+            if not isinstance(dies_data, (list, tuple)):
+                raise ValueError("wafer_map_data.dies must be a list of {x, y, available} objects")
+            
+            try:
+                xs = [die_data['x'] for die_data in dies_data]
+                ys = [die_data['y'] for die_data in dies_data]
+                available = [die_data.get('available', True) for die_data in dies_data]
+            except (KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f"Invalid die entry in wafer_map_data.dies: {e!r}") from e
+            
+            # Validate before converting so nothing is truncated or coerced on the way into the arrays
+            for axis, coords in (('x', xs), ('y', ys)):
+                for value in coords:
+                    if not _is_integral(value):
+                        raise ValueError(f"Invalid die entry in wafer_map_data.dies: {axis}={value!r} is not an integer")
+            for value in available:
+                if type(value) is not bool:
+                    raise ValueError(f"Invalid die entry in wafer_map_data.dies: available={value!r} is not a boolean")
+            
+            try:
+                return WaferMap.from_arrays(np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64),
+                                            np.array(available, dtype=bool))
+            except OverflowError as e:
+                raise ValueError(f"Invalid die entry in wafer_map_data.dies: {e}") from e
         
-        return WaferMap(dies)
+        # Generate grid-based wafer map (default 5x5 grid)
+        size = wafer_map_data.get('grid_size', 5)
+        if not isinstance(size, int) or isinstance(size, bool):
+            raise ValueError("wafer_map_data.grid_size must be an integer")
+        size = max(size, 0)
+        xs, ys = np.mgrid[0:size, 0:size]
+        return WaferMap.from_arrays(xs.ravel(), ys.ravel(), np.ones(xs.size, dtype=bool))
     
     def _calculate_coverage_stats(self, wafer_map: WaferMap, selected_dies: List[Die]) -> Dict[str, Any]:
         """Calculate coverage statistics for simulation results."""
-        total_dies = len(wafer_map.dies)
-        available_dies = len(wafer_map.get_available_dies())
+        total_dies = wafer_map.die_count
+        available_dies = wafer_map.available_count
         selected_count = len(selected_dies)
         
         coverage_percentage = (selected_count / available_dies * 100) if available_dies > 0 else 0
         
-        # Calculate distribution statistics
+        # Calculate distribution statistics with NumPy reductions over the selected coordinates
         if selected_dies:
-            x_coords = [die.x for die in selected_dies]
-            y_coords = [die.y for die in selected_dies]
+            x_coords = np.fromiter((die.x for die in selected_dies), dtype=np.int64, count=selected_count)
+            y_coords = np.fromiter((die.y for die in selected_dies), dtype=np.int64, count=selected_count)
             
             distribution = {
-                "x_range": {"min": min(x_coords), "max": max(x_coords)},
-                "y_range": {"min": min(y_coords), "max": max(y_coords)},
+                "x_range": {"min": int(x_coords.min()), "max": int(x_coords.max())},
+                "y_range": {"min": int(y_coords.min()), "max": int(y_coords.max())},
                 "center_of_mass": {
-                    "x": sum(x_coords) / len(x_coords),
-                    "y": sum(y_coords) / len(y_coords)
+                    "x": int(x_coords.sum()) / selected_count,
+                    "y": int(y_coords.sum()) / selected_count
                 }
             }
         else:
@@ -254,12 +432,26 @@ class StrategyService:
         }
 
 
-# Singleton instance
-_strategy_service = None
+def _is_integral(value: Any) -> bool:
+    """True for ints and integral floats; bools, strings and fractional values are rejected."""
+    if type(value) is int:
+        return True
+    return type(value) is float and value.is_integer()
+
+
+# Singleton instance; the lock only guards first construction
+_strategy_service: Optional[StrategyService] = None
+_strategy_service_lock = threading.Lock()
 
 def get_strategy_service() -> StrategyService:
     """Get singleton instance of StrategyService."""
     global _strategy_service
-    if _strategy_service is None:
-        _strategy_service = StrategyService()
-    return _strategy_service
\ No newline at end of file
+    service = _strategy_service
+    if service is not None:
+        return service
+    with _strategy_service_lock:
+        if _strategy_service is None:
+            _strategy_service = StrategyService()
+            # Kernels are process-global, so warm them once, for the shared service, off the request path
+            threading.Thread(target=_strategy_service._warm_up, name="strategy-warmup", daemon=True).start()
+        return _strategy_service
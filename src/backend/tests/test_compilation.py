@@ -0,0 +1,98 @@
+import pytest
+from backend.app.core.models.die import Die
+from backend.app.core.models.wafer_map import WaferMap
+from backend.app.core.plugins.registry import plugin_registry
+from backend.app.core.plugins.rules import RulePluginFactory
+from backend.app.core.strategy.compilation import (
+    CompiledStrategy, ExecutableRule, ExecutionContext, RuleFactory, StrategyCompiler
+)
+from backend.app.core.strategy.definition import RuleConfig, StrategyDefinition
+
+@pytest.fixture
+def compiler():
+    return StrategyCompiler(RuleFactory(RulePluginFactory(plugin_registry)))
+
+@pytest.fixture
+def wafer_map():
+    dies = [Die(x, y, available=(x + y) % 7 != 0) for x in range(-6, 7) for y in range(-6, 7)]
+    return WaferMap(dies)
+
+def make_definition(*rules):
+    return StrategyDefinition(name="s", process_step="step", tool_type="tool", rules=list(rules))
+
+def interpreted(compiled, context):
+    """The per-rule execution loop the generated runner replaced."""
+    unique_dies = []
+    seen_coordinates = set()
+    for rule in compiled.compiled_rules:
+        for die in rule.apply(context.wafer_map, context, already_selected=seen_coordinates):
+            coord = (die.x, die.y)
+            if coord not in seen_coordinates:
+                seen_coordinates.add(coord)
+                unique_dies.append(die)
+    return unique_dies
+
+def test_generated_runner_matches_per_rule_loop(compiler, wafer_map):
+    compiled = compiler.compile(make_definition(
+        RuleConfig("fixed_point", {"points": [[0, 0], [3, 2], [-5, 4], [0, 1]]}),
+        RuleConfig("center_edge", {"center_count": 3, "edge_count": 6}),
+        RuleConfig("random_sampling", {"sample_count": 12, "seed": 11}),
+    ))
+    context = ExecutionContext(wafer_map, {}, {})
+    expected = [(d.x, d.y, d.available) for d in interpreted(compiled, context)]
+    assert [(d.x, d.y, d.available) for d in compiled.get_runner()(context)] == expected
+    assert [(d.x, d.y, d.available) for d in compiled.execute(context)] == expected
+    assert len(expected) == len(set((x, y) for x, y, _ in expected)) > 12
+
+class FixedResultRule(ExecutableRule):
+    def __init__(self, dies):
+        self.dies = dies
+
+    def apply(self, wafer_map, context, already_selected=None):
+        return list(self.dies)
+
+    def estimate_performance(self, wafer_map):
+        return {}
+
+def test_execute_keeps_first_occurrence_of_each_coordinate(wafer_map):
+    first, duplicate, other = Die(1, 1), Die(1, 1, available=False), Die(2, 2)
+    compiled = CompiledStrategy("id", "s", [FixedResultRule([first, other]), FixedResultRule([duplicate, first])],
+                                {}, {}, {})
+    selected = compiled.execute(ExecutionContext(wafer_map, {}, {}))
+    assert selected == [first, other]
+    assert selected[0] is first
+
+def test_rule_cache_is_bounded_lru():
+    factory = RuleFactory(RulePluginFactory(plugin_registry), cache_size=4)
+    configs = [RuleConfig("random_sampling", {"sample_count": 3, "seed": seed}) for seed in range(6)]
+    rules = [factory.create_rule(config) for config in configs[:4]]
+    # A hit refreshes seed 0, so the next two inserts evict seeds 1 and 2
+    assert factory.create_rule(configs[0]) is rules[0]
+    for config in configs[4:]:
+        factory.create_rule(config)
+    assert len(factory._rule_cache) == 4
+    assert factory.create_rule(configs[3]) is rules[3]
+    assert factory.create_rule(configs[0]) is rules[0]
+    assert factory.create_rule(configs[1]) is not rules[1]
+    assert len(factory._rule_cache) == 4
+
+class TwoArgumentRule:
+    """A rule written against the apply(wafer_map, context) interface that predates already_selected."""
+    def __init__(self, parameters):
+        self.points = [tuple(point) for point in parameters["points"]]
+
+    def apply(self, wafer_map, context):
+        return [Die(x, y) for x, y in self.points]
+
+    def estimate_performance(self, wafer_map):
+        return {}
+
+def test_rules_without_already_selected_still_run(wafer_map):
+    factory = RuleFactory()
+    factory.register_rule_type("two_argument", TwoArgumentRule)
+    compiled = StrategyCompiler(factory).compile(make_definition(
+        RuleConfig("two_argument", {"points": [[1, 1], [2, 2]]}),
+        RuleConfig("two_argument", {"points": [[2, 2], [3, 3]]}),
+    ))
+    selected = compiled.execute(ExecutionContext(wafer_map, {}, {}))
+    assert [(die.x, die.y) for die in selected] == [(1, 1), (2, 2), (3, 3)]
@@ -0,0 +1,33 @@
+from sqlalchemy import inspect
+from backend.app.core.database.models import DatabaseManager, SchematicModel
+from backend.app.core.models.schematic import DieBoundary, SchematicData
+
+def test_create_tables_upgrades_an_older_schema(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'legacy.db'}")
+    manager.create_tables()
+    # Recreate the schema an older release left behind: no packed boundaries, no composite indexes
+    with manager.engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_schematics_created_by_upload_date")
+        connection.exec_driver_sql("DROP INDEX ix_schematic_validations_schematic_id_date")
+        connection.exec_driver_sql("ALTER TABLE schematics DROP COLUMN die_boundaries_blob")
+        connection.exec_driver_sql(
+            "INSERT INTO schematics (id, filename, format_type, upload_date, coordinate_system, "
+            "die_boundaries_json, created_by) VALUES ('old', 'old.svg', 'svg', '2024-01-01 00:00:00', 'cartesian', '[]', 'tester')"
+        )
+
+    manager.create_tables()
+    manager.create_tables()
+
+    inspector = inspect(manager.engine)
+    assert "die_boundaries_blob" in {column["name"] for column in inspector.get_columns("schematics")}
+    assert "ix_schematics_created_by_upload_date" in {index["name"] for index in inspector.get_indexes("schematics")}
+    assert "ix_schematic_validations_schematic_id_date" in {
+        index["name"] for index in inspector.get_indexes("schematic_validations")
+    }
+    schematic = SchematicData(filename="new.svg", die_boundaries=[DieBoundary("d0", 0, 0, 10, 10, 5, 5)])
+    with manager.session_scope() as session:
+        session.add(SchematicModel.from_schematic_data(schematic, "tester"))
+    with manager.session_scope() as session:
+        loaded = {model.id: model.to_schematic_data() for model in session.query(SchematicModel)}
+    assert loaded["old"].die_boundaries == []
+    assert [boundary.die_id for boundary in loaded[schematic.id].die_boundaries] == ["d0"]
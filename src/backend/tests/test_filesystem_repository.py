@@ -0,0 +1,117 @@
+import json
+import os
+import pytest
+from backend.app.core.strategy.definition import RuleConfig, StrategyDefinition, StrategyLifecycle
+from backend.app.core.strategy.repository import FileSystemStrategyRepository
+
+@pytest.fixture
+def storage(tmp_path):
+    return str(tmp_path / "strategies")
+
+def make_definition(name, version="1.0.0", process_step="litho", tool_type="ASML", **kwargs):
+    return StrategyDefinition(name=name, version=version, process_step=process_step, tool_type=tool_type,
+                              rules=[RuleConfig("fixed_point", {"points": [[1, 1]]})], **kwargs)
+
+def test_save_and_get_latest_and_by_version(storage):
+    repo = FileSystemStrategyRepository(storage)
+    definition = make_definition("s")
+    repo.save(definition)
+    definition.version = "1.10.0"
+    definition.description = "newer"
+    repo.save(definition)
+    definition.version = "1.9.0"
+    definition.description = "older"
+    repo.save(definition)
+
+    assert repo.get_by_id(definition.id).description == "newer"
+    assert repo.get_by_id(definition.id, "1.9.0").description == "older"
+    assert repo.get_by_id(definition.id, "1.0.0").rules == definition.rules
+    assert repo.get_by_id(definition.id, "2.0.0") is None
+    assert repo.get_by_id("missing") is None
+    assert [v.version for v in repo.get_versions(definition.id)] == ["1.0.0", "1.10.0", "1.9.0"]
+
+def test_active_version_wins_and_list_filters(storage):
+    repo = FileSystemStrategyRepository(storage)
+    active = make_definition("active", lifecycle_state=StrategyLifecycle.ACTIVE)
+    repo.save(active)
+    active.version = "2.0.0"
+    active.lifecycle_state = StrategyLifecycle.DRAFT
+    repo.save(active)
+    other = make_definition("other", process_step="etch", tool_type="KLA")
+    repo.save_many([other])
+
+    assert repo.get_by_id(active.id).version == "1.0.0"
+    assert {d.name for d in repo.list_strategies()} == {"active", "other"}
+    assert [d.name for d in repo.list_strategies(process_step="etch")] == ["other"]
+    assert [d.name for d in repo.list_strategies(lifecycle_state=StrategyLifecycle.ACTIVE)] == ["active"]
+
+    assert repo.delete(other.id)
+    assert repo.get_by_id(other.id).lifecycle_state == StrategyLifecycle.DEPRECATED
+
+def test_reopen_reads_existing_directory(storage):
+    repo = FileSystemStrategyRepository(storage)
+    first, second = make_definition("a"), make_definition("b")
+    repo.save_many([first, second])
+
+    reopened = FileSystemStrategyRepository(storage)
+    assert reopened.get_by_id(first.id).name == "a"
+    assert {d.name for d in reopened.list_strategies()} == {"a", "b"}
+
+def test_stale_index_is_rebuilt_from_logs(storage):
+    repo = FileSystemStrategyRepository(storage)
+    definition = make_definition("s")
+    repo.save(definition)
+    index_path = os.path.join(storage, FileSystemStrategyRepository.INDEX_FILE)
+    with open(index_path) as f:
+        stale = f.read()
+    definition.version = "1.1.0"
+    repo.save(definition)
+    late = make_definition("late")
+    repo.save(late)
+    with open(index_path, "w") as f:
+        f.write(stale)
+
+    reopened = FileSystemStrategyRepository(storage)
+    assert reopened.get_by_id(definition.id).version == "1.1.0"
+    assert reopened.get_by_id(late.id).name == "late"
+    with open(index_path) as f:
+        assert set(json.load(f)) == {definition.id, late.id}
+
+def test_truncated_index_and_torn_log_recover(storage):
+    repo = FileSystemStrategyRepository(storage)
+    definition = make_definition("s")
+    repo.save(definition)
+    index_path = os.path.join(storage, FileSystemStrategyRepository.INDEX_FILE)
+    with open(index_path, "r+") as f:
+        f.truncate(5)
+    with open(os.path.join(storage, f"{definition.id}.jsonl"), "a") as f:
+        f.write('{"version": "9.0.0", "defin')
+
+    reopened = FileSystemStrategyRepository(storage)
+    assert reopened.get_by_id(definition.id).version == "1.0.0"
+    definition.version = "1.1.0"
+    reopened.save(definition)
+    assert [v.version for v in FileSystemStrategyRepository(storage).get_versions(definition.id)] == ["1.0.0", "1.1.0"]
+
+@pytest.mark.parametrize("strategy_id", ["../escape", "nested/id", "..", "", os.path.join(os.sep, "tmp", "abs")])
+def test_ids_that_are_not_plain_file_names_are_rejected(storage, strategy_id):
+    repo = FileSystemStrategyRepository(storage)
+    kept = make_definition("kept")
+    with pytest.raises(ValueError):
+        repo.save_many([kept, make_definition("bad", id=strategy_id)])
+    assert repo.get_by_id(kept.id) is None
+    assert not any(name.endswith(".jsonl") for name in os.listdir(storage))
+    assert not os.path.exists(os.path.join(os.path.dirname(storage), "escape.jsonl"))
+
+def test_records_without_a_version_are_skipped(storage):
+    repo = FileSystemStrategyRepository(storage)
+    definition = make_definition("s")
+    repo.save(definition)
+    with open(os.path.join(storage, f"{definition.id}.jsonl"), "a") as f:
+        f.write('{"definition": {}}\n[1, 2]\n{"version": 3}\n')
+    definition.version = "1.1.0"
+    FileSystemStrategyRepository(storage).save(definition)
+
+    reopened = FileSystemStrategyRepository(storage)
+    assert reopened.get_by_id(definition.id).version == "1.1.0"
+    assert [v.version for v in reopened.get_versions(definition.id)] == ["1.0.0", "1.1.0"]
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.app.api.middleware import RequestScopeMiddleware
+from backend.app.core.strategy.definition import StrategyType
+from backend.app.core.strategy.repository import InMemoryStrategyRepository
+from backend.app.services.strategy_service import StrategyService, request_scope
+
+class CountingRepository(InMemoryStrategyRepository):
+    """Counts fetches so tests can tell a scoped lookup from a repository read."""
+    def __init__(self):
+        super().__init__()
+        self.fetches = 0
+
+    def get_by_id(self, strategy_id, version=None):
+        self.fetches += 1
+        return super().get_by_id(strategy_id, version)
+
+@pytest.fixture
+def repository():
+    return CountingRepository()
+
+@pytest.fixture
+def service(repository):
+    return StrategyService(repository=repository)
+
+@pytest.fixture
+def strategy_id(service, repository):
+    strategy_id = service.create_strategy("s", "", "step", "tool", StrategyType.CUSTOM, "author").id
+    repository.fetches = 0
+    return strategy_id
+
+def test_scope_fetches_each_strategy_once(service, repository, strategy_id):
+    with request_scope():
+        first = service.get_strategy(strategy_id)
+        assert service.get_strategy(strategy_id) is first
+        assert repository.fetches == 1
+    service.get_strategy(strategy_id)
+    service.get_strategy(strategy_id)
+    assert repository.fetches == 3
+
+def test_concurrent_tasks_do_not_share_a_scope(service, repository, strategy_id):
+    async def one_request():
+        with request_scope():
+            service.get_strategy(strategy_id)
+            await asyncio.sleep(0)
+            await asyncio.to_thread(service.get_strategy, strategy_id)
+
+    async def main():
+        await asyncio.gather(one_request(), one_request())
+
+    asyncio.run(main())
+    # One fetch per task; each worker thread reused its own task's scope
+    assert repository.fetches == 2
+
+def test_middleware_gives_each_request_its_own_scope(service, repository, strategy_id):
+    app = FastAPI()
+    app.add_middleware(RequestScopeMiddleware)
+
+    @app.get("/twice")
+    async def twice():
+        first = service.get_strategy(strategy_id)
+        second = await asyncio.to_thread(service.get_strategy, strategy_id)
+        return {"same": first is second}
+
+    client = TestClient(app)
+    for request_number in (1, 2):
+        assert client.get("/twice").json() == {"same": True}
+        assert repository.fetches == request_number
+
+def test_scope_sees_saved_updates(service, repository, strategy_id):
+    with request_scope():
+        before = service.get_strategy(strategy_id)
+        service.update_strategy(strategy_id, {"description": "updated"})
+        assert service.get_strategy(strategy_id).description == "updated"
+        assert before.description == ""
+        with service.batch():
+            service.update_strategy(strategy_id, {"description": "batched"})
+        assert service.get_strategy(strategy_id).description == "batched"
@@ -0,0 +1,40 @@
+import pytest
+from backend.app.core.models.die import Die
+from backend.app.core.models.wafer_map import WaferMap
+from backend.app.core.plugins.registry import plugin_registry
+from backend.app.core.plugins.rules import RulePluginFactory
+
+@pytest.fixture
+def factory():
+    return RulePluginFactory(plugin_registry)
+
+@pytest.fixture
+def wafer_map():
+    dies = [Die(x, y, available=(x, y) != (3, 3)) for x in range(5) for y in range(5)]
+    return WaferMap(dies)
+
+def test_fixed_point_accepts_list_points_and_skips_unavailable(factory, wafer_map):
+    rule = factory.create_rule("fixed_point", {"points": [[1, 1], (2, 2), [3, 3]]})
+    result = rule.apply(wafer_map, None)
+    coords = [(die.x, die.y) for die in result]
+    assert coords == [(1, 1), (2, 2)]
+
+def test_random_sampling_seed_is_reproducible_and_leaves_global_rng_alone(factory, wafer_map):
+    import random
+    random.seed(123)
+    expected_global = random.random()
+    random.seed(123)
+    rule = factory.create_rule("random_sampling", {"sample_count": 4, "seed": 7})
+    first = rule.apply(wafer_map, None)
+    second = rule.apply(wafer_map, None)
+    assert [(d.x, d.y) for d in first] == [(d.x, d.y) for d in second]
+    assert all(die.available for die in first)
+    assert random.random() == expected_global
+
+def test_fixed_point_never_aliases_coordinates_beyond_int32(factory):
+    wafer_map = WaferMap([Die(0, 5), Die(0, 2 ** 32 + 5)])
+    rule = factory.create_rule("fixed_point", {"points": [[0, 5], [0, 2 ** 32 + 5]]})
+    with pytest.raises(ValueError):
+        rule.apply(wafer_map, None)
+    in_range = WaferMap([Die(0, 5), Die(1, 5)])
+    assert [(d.x, d.y) for d in rule.apply(in_range, None)] == [(0, 5)]
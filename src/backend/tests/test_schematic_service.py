@@ -0,0 +1,81 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from backend.app.core.database.models import DatabaseManager
+from backend.app.core.models.schematic import (
+    DieBoundary, SchematicData, SchematicValidationResult, ValidationStatus
+)
+from backend.app.core.strategy.definition import StrategyDefinition
+from backend.app.services import schematic_service as schematic_module
+from backend.app.services.schematic_service import SchematicService, _MAX_CONFLICTS
+
+class FixedPointsCompiler:
+    """Compiler stub whose strategies always return the given points in order."""
+    def __init__(self, points):
+        self.points = points
+    def compile(self, strategy):
+        return SimpleNamespace(execute=lambda context: self.points)
+
+@pytest.fixture(autouse=True)
+def in_memory_database(monkeypatch):
+    monkeypatch.setattr(schematic_module, "db_manager", DatabaseManager("sqlite://"))
+
+@pytest.fixture
+def schematic():
+    return SchematicData(die_boundaries=[DieBoundary("d0", 0, 0, 10, 10, 5, 5, available=False)])
+
+def validate(schematic, points):
+    service = SchematicService(compiler=FixedPointsCompiler(points))
+    return service._validate_one(StrategyDefinition(), schematic, schematic.id, "tester")
+
+def make_points(*groups):
+    return [SimpleNamespace(x=x, y=y) for (x, y), count in groups for _ in range(count)]
+
+@pytest.mark.parametrize("groups", [
+    (((5, 5), _MAX_CONFLICTS + 200), ((100, 100), 10)),
+    (((100, 100), 10), ((5, 5), _MAX_CONFLICTS + 200)),
+])
+def test_severity_totals_do_not_depend_on_conflict_cap(schematic, groups):
+    result = validate(schematic, make_points(*groups))
+    assert result.validation_status == ValidationStatus.FAIL
+    assert result.error_count == 10
+    # Every unavailable-die hit plus the overflow notice
+    assert result.warning_count == _MAX_CONFLICTS + 200 + 1
+    assert len(result.conflicts) == _MAX_CONFLICTS
+    assert sum(c.severity == "error" for c in result.conflicts) == 10
+    assert [w.warning_type for w in result.warnings] == ["conflict_overflow"]
+
+def test_errors_past_the_cap_are_counted(schematic):
+    result = validate(schematic, make_points(((100, 100), _MAX_CONFLICTS + 5)))
+    assert result.validation_status == ValidationStatus.FAIL
+    assert result.error_count == _MAX_CONFLICTS + 5
+    assert len(result.conflicts) == _MAX_CONFLICTS
+    assert result.alignment_score == 0.0
+
+def collect_pages(list_page, date_key, id_key):
+    items, cursor = [], {}
+    while True:
+        page = list_page(limit=2, **cursor)
+        if not page:
+            return items
+        items += page
+        cursor = {"after": datetime.fromisoformat(page[-1][date_key]), "after_id": page[-1][id_key]}
+
+def test_listing_pages_through_rows_sharing_a_timestamp():
+    service = SchematicService(compiler=FixedPointsCompiler([]))
+    shared, older = datetime(2024, 5, 1, 12), datetime(2024, 4, 1, 12)
+    schematics = [SchematicData(id=f"s{i}", filename=f"s{i}.svg", upload_date=shared) for i in range(5)]
+    schematics.append(SchematicData(id="s-old", filename="old.svg", upload_date=older))
+    for data in schematics:
+        service._save_schematic(data, "tester")
+        service._save_validation_result(SchematicValidationResult(
+            validation_id=f"v-{data.id}", schematic_id="target", validation_date=data.upload_date
+        ), "tester")
+
+    listed = collect_pages(service.list_schematics, "upload_date", "id")
+    assert [item["id"] for item in listed] == ["s4", "s3", "s2", "s1", "s0", "s-old"]
+    validations = collect_pages(
+        lambda **kwargs: service.list_validation_results(schematic_id="target", **kwargs),
+        "validation_date", "validation_id"
+    )
+    assert [item["validation_id"] for item in validations] == ["v-s4", "v-s3", "v-s2", "v-s1", "v-s0", "v-s-old"]
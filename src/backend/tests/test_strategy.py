@@ -25,3 +25,19 @@ def test_strategy_applies_all_rules(wafer_map):
     coords = [(die.x, die.y) for die in result]
     assert (0, 0) in coords
     assert (4, 4) in coords
+
+def test_dies_read_from_map_are_read_only(wafer_map):
+    die = wafer_map.dies[3]
+    with pytest.raises(AttributeError):
+        die.available = False
+    wafer_map.set_available(3, False)
+    assert not wafer_map.dies[3].available
+    assert wafer_map.available_count == 24
+    assert (die.x, die.y) not in {(d.x, d.y) for d in wafer_map.get_available_dies()}
+
+def test_wafer_map_rejects_fractional_coordinates():
+    assert WaferMap([Die(1.0, 2)]).dies[0].x == 1
+    with pytest.raises(ValueError):
+        WaferMap([Die(1.5, 2)])
+    with pytest.raises(ValueError):
+        WaferMap([Die("1", 2)])
@@ -0,0 +1,103 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.app.api.routes.strategies import router
+from backend.app.core.strategy.definition import StrategyType
+from backend.app.core.strategy.repository import InMemoryStrategyRepository
+from backend.app.services.strategy_service import StrategyService, get_strategy_service
+
+class RecordingRepository(InMemoryStrategyRepository):
+    """Records each repository write call as the list of strategy ids it saved."""
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+        self._in_save_many = False
+
+    def save(self, definition):
+        if not self._in_save_many:
+            self.writes.append([definition.id])
+        return super().save(definition)
+
+    def save_many(self, definitions):
+        self.writes.append([definition.id for definition in definitions])
+        self._in_save_many = True
+        try:
+            return super().save_many(definitions)
+        finally:
+            self._in_save_many = False
+
+@pytest.fixture
+def repository():
+    return RecordingRepository()
+
+@pytest.fixture
+def service(repository):
+    return StrategyService(repository=repository)
+
+@pytest.fixture
+def strategy_ids(service, repository):
+    ids = [service.create_strategy(f"s{i}", "", "step", "tool", StrategyType.CUSTOM, "author").id for i in range(3)]
+    repository.writes.clear()
+    return ids
+
+def test_batch_writes_once_and_coalesces_repeat_saves(service, repository, strategy_ids):
+    with service.batch():
+        for strategy_id in strategy_ids:
+            service.update_strategy(strategy_id, {"description": "first"})
+        service.update_strategy(strategy_ids[0], {"description": "second"})
+        assert repository.writes == []
+        assert service.get_strategy(strategy_ids[0]).description == "second"
+    assert repository.writes == [strategy_ids]
+
+def test_batch_writes_nothing_when_block_raises(service, repository, strategy_ids):
+    with pytest.raises(RuntimeError):
+        with service.batch():
+            service.update_strategy(strategy_ids[0], {"description": "lost"})
+            raise RuntimeError("abort")
+    assert repository.writes == []
+    with pytest.raises(ValueError):
+        service.bulk_update([(strategy_ids[0], {"name": "kept?"}), ("missing", {"name": "x"})])
+    with pytest.raises(ValueError):
+        service.update_strategy(strategy_ids[1], {"name": ""})
+    assert repository.writes == []
+    assert service.get_strategy(strategy_ids[0]).description == ""
+    assert [service.get_strategy(strategy_id).name for strategy_id in strategy_ids[:2]] == ["s0", "s1"]
+
+def test_nested_batches_join_the_outermost(service, repository, strategy_ids):
+    with service.batch():
+        service.update_strategy(strategy_ids[0], {"description": "outer"})
+        with service.batch():
+            service.update_strategy(strategy_ids[1], {"description": "inner"})
+        assert repository.writes == []
+        try:
+            with service.batch():
+                service.update_strategy(strategy_ids[2], {"description": "inner failed"})
+                raise RuntimeError("inner abort")
+        except RuntimeError:
+            pass
+    # The inner failure did not end the outer batch, which still commits everything once
+    assert repository.writes == [strategy_ids]
+    service.update_strategy(strategy_ids[0], {"description": "after"})
+    assert repository.writes[-1] == [strategy_ids[0]]
+
+def test_bulk_update_route(service, repository, strategy_ids):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_strategy_service] = lambda: service
+    client = TestClient(app)
+
+    response = client.post("/api/v1/strategies/bulk-update", json=[
+        {"strategy_id": strategy_ids[0], "name": "renamed"},
+        {"strategy_id": strategy_ids[1], "description": "updated"},
+    ])
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()] == ["renamed", "s1"]
+    assert repository.writes == [strategy_ids[:2]]
+
+    response = client.post("/api/v1/strategies/bulk-update", json=[
+        {"strategy_id": strategy_ids[2], "name": "never saved"},
+        {"strategy_id": "missing", "name": "x"},
+    ])
+    assert response.status_code == 404
+    assert repository.writes == [strategy_ids[:2]]
+    assert service.get_strategy(strategy_ids[2]).name == "s2"
@@ -0,0 +1,37 @@
+import copy
+import pytest
+from backend.app.core.strategy.definition import RuleConfig, StrategyDefinition
+from backend.app.core.strategy.repository import InMemoryStrategyRepository, StrategyManager
+
+def test_rule_config_parameters_are_frozen_and_hashable():
+    params = {"points": [[1, 2]], "nested": {"values": [3]}}
+    rule = RuleConfig("fixed_point", params)
+    params["points"].append([5, 6])
+    assert rule.parameters["points"] == ((1, 2),)
+    with pytest.raises(TypeError):
+        rule.parameters["points"] = []
+    with pytest.raises(TypeError):
+        rule.parameters["nested"].update(values=[])
+    assert hash(rule) == hash(RuleConfig("fixed_point", {"points": [(1, 2)], "nested": {"values": (3,)}}))
+    assert copy.deepcopy(rule) == rule
+
+def test_get_or_create_shares_identical_configs():
+    first = RuleConfig.get_or_create("fixed_point", {"points": [[0, 0]]})
+    assert RuleConfig.get_or_create("fixed_point", {"points": [[0, 0]]}) is first
+    assert RuleConfig.get_or_create("fixed_point", {"points": [[0.0, 0]]}) is not first
+    assert RuleConfig.get_or_create("fixed_point", {"points": [[0, 0]]}, weight=2.0) is not first
+
+def test_clone_cannot_change_source_rules():
+    manager = StrategyManager(InMemoryStrategyRepository())
+    source = manager.create_strategy("source", "step", "tool", "author")
+    source.rules = [RuleConfig.get_or_create("fixed_point", {"points": [[1, 1]]})]
+    clone = manager.clone_strategy(source.id, "clone", "author")
+    with pytest.raises(TypeError):
+        clone.rules[0].parameters["points"] = [[2, 2]]
+    clone.rules[0] = RuleConfig("fixed_point", {"points": [[2, 2]]})
+    assert source.rules[0].parameters["points"] == ((1, 1),)
+
+def test_to_dict_round_trip_keeps_rules():
+    definition = StrategyDefinition(name="s", rules=[RuleConfig("uniform_grid", {"spacing_x": 2, "offsets": [1, 2]})])
+    restored = StrategyDefinition.from_dict(definition.to_dict())
+    assert restored.rules == definition.rules
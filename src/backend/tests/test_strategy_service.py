@@ -0,0 +1,68 @@
+import pytest
+from backend.app.core.strategy.definition import RuleConfig, StrategyType
+from backend.app.services.strategy_service import StrategyService
+
+@pytest.fixture
+def service():
+    return StrategyService(use_database=False)
+
+@pytest.fixture
+def strategy_id(service):
+    definition = service.create_strategy("s", "", "step", "tool", StrategyType.CUSTOM, "author")
+    service.update_strategy(definition.id, {"rules": [{"rule_type": "fixed_point", "parameters": {"points": [[1, 1]]}}]})
+    return definition.id
+
+def simulate(service, strategy_id, wafer_map_data):
+    return service.simulate_strategy(strategy_id, wafer_map_data, {}, {})
+
+def test_simulate_accepts_integral_coordinates(service, strategy_id):
+    result = simulate(service, strategy_id, {"dies": [{"x": 1.0, "y": 1}, {"x": 2, "y": 2, "available": False}]})
+    assert result["selected_points"] == [{"x": 1, "y": 1, "available": True}]
+    assert result["coverage_stats"]["total_dies"] == 2
+
+@pytest.mark.parametrize("die", [
+    {"x": 3.7, "y": 1},
+    {"x": 1, "y": float("nan")},
+    {"x": True, "y": 1},
+    {"x": "1", "y": 1},
+    {"x": 1, "y": None},
+    {"x": 2 ** 70, "y": 1},
+    {"x": 1, "y": 1, "available": "false"},
+    {"x": 1, "y": 1, "available": 0},
+    {"x": 1},
+    [1, 1],
+])
+def test_simulate_rejects_malformed_dies(service, strategy_id, die):
+    with pytest.raises(ValueError):
+        simulate(service, strategy_id, {"dies": [{"x": 0, "y": 0}, die]})
+
+@pytest.mark.parametrize("wafer_map_data", [{"dies": "not a list"}, {"grid_size": 2.5}, {"grid_size": True}])
+def test_simulate_rejects_malformed_wafer_map(service, strategy_id, wafer_map_data):
+    with pytest.raises(ValueError):
+        simulate(service, strategy_id, wafer_map_data)
+
+def test_simulate_sees_edits_made_without_a_version_bump(service, strategy_id):
+    wafer_map_data = {"grid_size": 3}
+    assert simulate(service, strategy_id, wafer_map_data)["selected_points"] == [{"x": 1, "y": 1, "available": True}]
+    definition = service.repository.get_by_id(strategy_id)
+    definition.rules = [RuleConfig("fixed_point", {"points": [[2, 2]]})]
+    service.repository.save(definition)
+    assert simulate(service, strategy_id, wafer_map_data)["selected_points"] == [{"x": 2, "y": 2, "available": True}]
+
+def test_simulate_async_works_across_event_loops(service, strategy_id):
+    import asyncio
+    wafer_map_data = {"grid_size": 3}
+    expected = simulate(service, strategy_id, wafer_map_data)["selected_points"]
+    for _ in range(2):
+        results = asyncio.run(service.simulate_strategies_batch([
+            {"strategy_id": strategy_id, "wafer_map_data": wafer_map_data,
+             "process_parameters": {}, "tool_constraints": {}}
+            for _ in range(4)
+        ]))
+        assert [result["selected_points"] for result in results] == [expected] * 4
+
+def test_warm_up_builds_rules_without_compiling_strategies():
+    service = StrategyService(use_database=False)
+    service._warm_up()
+    assert len(service.compiler._compilation_cache) == 0
+    assert len(service.rule_factory._rule_cache) == len(service.rule_factory.get_available_rule_types())
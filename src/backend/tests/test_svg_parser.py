@@ -0,0 +1,50 @@
+from pathlib import Path
+import pytest
+from backend.app.core.parsers.svg_parser import SVGParser
+
+FIXTURE = Path(__file__).parent / "fixtures" / "nested_groups.svg"
+
+# Recorded from the ElementTree-based parser that the expat scan replaced; transforms are
+# ignored by both, so nested group boxes are the union of their direct children's boxes
+EXPECTED_BOUNDARIES = [
+    ('die_001', 104.0, 1.0, 116.0, 13.0, 'shape_detection', 'circle_9'),
+    ('die_002', 70.0, 0.0, 85.0, 15.0, 'shape_detection', 'rect_6'),
+    ('die_group_2', 70.0, 0.0, 116.0, 15.0, 'group_detection', 'die_group_2'),
+    ('die_003', 130.0, 0.0, 145.0, 15.0, 'shape_detection', 'polygon_12'),
+    ('die_004', 0.0, 0.0, 20.0, 20.0, 'shape_detection', 'rect_1'),
+    ('die_005', 10.0, 0.0, 30.0, 20.0, 'shape_detection', 'rect_4'),
+    ('die_006', 10.0, 0.0, 60.0, 20.0, 'group_detection', 'row_a'),
+    ('die_007', 40.0, 0.0, 60.0, 20.0, 'shape_detection', 'rect_5'),
+    ('die_1', 10.0, 10.0, 30.0, 30.0, 'shape_detection', 'die_1'),
+    ('die_008', 40.0, 10.0, 60.0, 30.0, 'shape_detection', 'rect_3'),
+    ('cell-7', 90.0, 10.0, 110.0, 30.0, 'shape_detection', 'cell-7'),
+    ('die_009', 118.0, 12.0, 142.0, 28.0, 'shape_detection', 'ellipse_10'),
+    ('die_010', 150.0, 10.0, 170.0, 30.0, 'shape_detection', 'polygon_11'),
+    ('die_011', 180.0, 10.0, 200.0, 30.0, 'shape_detection', 'path_13'),
+    ('die_012', 10.0, 120.0, 40.0, 150.0, 'shape_detection', 'rect_7'),
+    ('die_42', 52.0, 127.0, 68.0, 143.0, 'text_detection', None),
+    ('die_013', 84.0, 129.0, 96.0, 141.0, 'text_detection', None),
+    ('cell_3', 83.0, 128.0, 107.0, 152.0, 'text_detection', None),
+]
+EXPECTED_ELEMENT_COUNTS = {'svg': 1, 'title': 1, 'desc': 1, 'defs': 1, 'symbol': 1, 'rect': 8, 'circle': 2, 'ellipse': 1, 'polygon': 2, 'path': 1, 'g': 4, 'text': 3, 'tspan': 1, 'use': 1}
+
+def boundary_rows(schematic, scale=1.0):
+    return [(b.die_id, b.x_min / scale, b.y_min / scale, b.x_max / scale, b.y_max / scale,
+             b.metadata.get("source"), b.metadata.get("element_id")) for b in schematic.die_boundaries]
+
+def test_svg_boundaries_match_element_tree_parser():
+    schematic = SVGParser().parse_file(str(FIXTURE))
+    assert boundary_rows(schematic) == EXPECTED_BOUNDARIES
+    assert schematic.wafer_size == "200mm"
+    layer_info = schematic.metadata.layer_info
+    assert layer_info["element_counts"] == EXPECTED_ELEMENT_COUNTS
+    assert layer_info["element_count"] == sum(EXPECTED_ELEMENT_COUNTS.values())
+    assert (layer_info["title"], layer_info["description"]) == ("Test wafer", "Nested groups with transforms")
+
+def test_svg_coordinate_scale_and_size_filter():
+    parser = SVGParser()
+    scaled = parser.parse_file(str(FIXTURE), coordinate_scale=2.0)
+    assert boundary_rows(scaled, scale=2.0) == EXPECTED_BOUNDARIES
+    filtered = parser.parse_file(str(FIXTURE), die_size_filter=(10, 25))
+    assert all(10 <= b.width <= 25 and 10 <= b.height <= 25 for b in filtered.die_boundaries)
+    assert len(filtered.die_boundaries) == 15